@@ -0,0 +1,22 @@
+#! /usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+argtools: Decorators for testing arguments of functions.
+Submodules and names are imported on first access (PEP 562).
+"""
+
+
+from moduletools.lazy import lazymodule
+
+
+(__getattr__, __dir__, __all__) = lazymodule(__name__, ['argstest'], {
+    'argtest': 'argstest',
+    'rangetest': 'argstest',
+    'typetest': 'argstest',
+    'valuetest': 'argstest',
+    'each': 'argstest',
+    'Sampler': 'argstest',
+    'PredicateCache': 'argstest',
+    'samplestats': 'argstest',
+    'cachestats': 'argstest',
+})
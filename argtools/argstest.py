@@ -28,23 +28,506 @@ msg()
 msg('majestic', 'Moose')
 # msg('Giant', 'Redwood')
 # msg('great', word2='elm')
+
+
+@rangetest(Sampler(every=100, per_second=1000), x=(0, 1))
+def scale(x):
+    return x * 2
+
+
+scale(0.5)
+print(samplestats())
+
+
+@valuetest(None, PredicateCache(maxsize=4096, ttl=60), code=re.compile('[A-Z]{3}').fullmatch)
+def convert(code, amount):
+    return amount
+
+
+convert('USD', 10)
+print(cachestats())
 """
 
 
+from __future__ import annotations
 from typing import Callable, Any, Union
+from inspect import CO_VARARGS, CO_VARKEYWORDS, unwrap
+from collections import OrderedDict
+from itertools import repeat, count
+import threading
+import time
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+SAMPLERS = {}
+CACHES = {}
+
+
+def counted(counter: count) -> int:
+    """
+    counted: Returns next value of itertools.count without advancing it.
+    """
+    return int(repr(counter)[6:-1])
+
+
+def outofrange(arg: Any, vals: tuple) -> bool:
+    """
+    outofrange: Fails if arg is not in range vals.
+    """
+    return arg < vals[0] or arg > vals[1]
+
+
+def nottype(arg: Any, type: Any) -> bool:
+    """
+    nottype: Fails if arg is not instance of type.
+    """
+    return not isinstance(arg, type)
+
+
+def nottrue(arg: Any, tester: Callable) -> bool:
+    """
+    nottrue: Fails if tester(arg) is false.
+    """
+    return not tester(arg)
+
+
+class each:
+    """
+    each is a class of criteria that is applied to every element of sequence or array.
+    Whole buffer is checked in one pass: numpy is used for arrays when it's installed,
+    otherwise min()/max(), all() and map() loop in C.
+
+    Usage:
+    @rangetest(xs=each(0, 255))
+    @typetest(xs=each(int, shape=(3,)), ys=each(dtype='float64'))
+    @valuetest(words=each(str.islower))
+    """
+    def __init__(self: each, *criteria: tuple, dtype: Any = None, shape: tuple = None) -> None:
+        """
+        Args:
+            criteria (tuple): range, type or tester for every element.
+            dtype (Any, optional): required numpy dtype of array. Defaults to None.
+            shape (tuple, optional): required shape (len for sequences). Defaults to None.
+        """
+        self.criteria = criteria[0] if len(criteria) == 1 else (criteria or None)
+        self.dtype = dtype if dtype is None or numpy is None else numpy.dtype(dtype)
+        self.shape = shape
+
+    def __repr__(self: each) -> str:
+        extras = ''.join(f', {name}={getattr(self, name)}' for name in ('dtype', 'shape') if getattr(self, name))
+        return f'each({self.criteria}{extras})'
+
+    def failif(self: each, failif: Callable) -> Callable:
+        """
+        failif is a method that builds test for whole buffer from test for one element.
+
+        Args:
+            failif (Callable): lambda that fails if element fails.
+
+        Returns:
+            Callable: lambda that fails if any element or dtype/shape fails.
+        """
+        def failelements(arg: Any, criteria: each) -> bool:
+            if isinstance(arg, numpy.ndarray if numpy else ()):
+                if failif is outofrange:
+                    return arg.size > 0 and bool(arg.min() < criteria[0] or arg.max() > criteria[1])
+                if failif is nottype and arg.dtype != object:
+                    return not any(numpy.issubdtype(arg.dtype, type) for type in
+                                   (criteria if isinstance(criteria, tuple) else (criteria,)))
+            if failif is outofrange:
+                return bool(arg) and (min(arg) < criteria[0] or max(arg) > criteria[1])
+            if failif is nottype:
+                return not all(map(isinstance, arg, repeat(criteria)))
+            if failif is nottrue:
+                return not all(map(criteria, arg))
+            return any(failif(element, criteria) for element in arg)
+
+        def on_fail(arg: Any, criteria: each) -> bool:
+            if self.shape is not None:
+                shape = arg.shape if hasattr(arg, 'shape') else (len(arg),)
+                if tuple(shape) != tuple(self.shape):
+                    return True
+            if self.dtype is not None and getattr(arg, 'dtype', None) != self.dtype:
+                return True
+            return self.criteria is not None and failelements(arg, self.criteria)
+
+        return on_fail
+
+
+class Sampler:
+    """
+    Sampler is a class that decides which calls of decorated function are checked.
+    It checks 1 call in every and at most per_second calls in each second, and counts
+    checked, skipped and failed calls. Calls and checks are counted by itertools.count,
+    so skipped call takes no lock, only the per-second window and failures are locked.
+    argtest makes own Sampler for every decorated function and registers it in SAMPLERS
+    by module and qualified name of the function.
+    """
+    def __init__(self: Sampler, every: int = 1, per_second: int = None, name: str = '') -> None:
+        """
+        Args:
+            every (int, optional): check 1 call in every calls. Defaults to 1.
+            per_second (int, optional): max checks per second or None. Defaults to None.
+            name (str, optional): name of the function. Defaults to ''.
+        """
+        self.every = every
+        self.per_second = per_second
+        self.name = name
+        self.lock = threading.Lock()
+        self.calls = count(1)
+        self.checks = count(1)
+        self.reset()
+
+    def reset(self: Sampler) -> None:
+        """
+        reset is a method that sets all counters to zero. Counters are not rebound,
+        so compiled checkers keep using them, their current values become the base.
+        """
+        with self.lock:
+            self.base = (counted(self.calls), counted(self.checks))
+            self.failed = 0
+            self.window = time.monotonic()
+            self.inwindow = 0
+
+    def admit(self: Sampler) -> bool:
+        """
+        admit is a method that decides whether the current call should be checked.
+
+        Returns:
+            bool: True if call should be checked.
+        """
+        return not next(self.calls) % self.every and self.admitted()
+
+    def admitted(self: Sampler) -> bool:
+        """
+        admitted is a method that decides whether the call which passed every filter
+        should be checked (per_second limit) and counts it.
+
+        Returns:
+            bool: True if call should be checked.
+        """
+        if self.per_second is not None:
+            with self.lock:
+                now = time.monotonic()
+
+                if now - self.window >= 1:
+                    self.window = now
+                    self.inwindow = 0
+
+                if self.inwindow >= self.per_second:
+                    return False
+
+                self.inwindow += 1
+
+        next(self.checks)
+        return True
+
+    def stats(self: Sampler) -> dict:
+        """
+        stats is a method that returns counters of the sampler.
+
+        Returns:
+            dict: checked, skipped and failed calls.
+        """
+        checked = counted(self.checks) - self.base[1]
+        calls = counted(self.calls) - self.base[0]
+        return {'checked': checked, 'skipped': max(calls - checked, 0), 'failed': self.failed}
+
+
+def samplestats() -> dict:
+    """
+    samplestats is a function that returns counters of all registered samplers.
+
+    Returns:
+        dict: {function name: {'checked': ..., 'skipped': ..., 'failed': ...}}.
+    """
+    return {name: sampler.stats() for (name, sampler) in SAMPLERS.items()}
 
 
-def argtest(argchecks: dict, failif: Callable) -> Callable:
+class PredicateCache:
+    """
+    PredicateCache is a bounded cache of test outcomes keyed by value for every argument.
+    Repeated hashable values skip the tester, unhashable values are always tested.
+    Hit costs one dict lookup, TTL compare and move of the outcome to the end of its
+    table without lock, the lock is taken only for inserts and evictions, so the least
+    recently used outcome is evicted first.
+    argtest makes own PredicateCache for every decorated function and registers it
+    in CACHES by module and qualified name of the function.
+    """
+    def __init__(self: PredicateCache, maxsize: int = 1024, ttl: float = None, name: str = '') -> None:
+        """
+        Args:
+            maxsize (int, optional): max number of cached outcomes of every argument. Defaults to 1024.
+            ttl (float, optional): seconds while outcome is valid or None. Defaults to None.
+            name (str, optional): name of the function. Defaults to ''.
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.name = name
+        self.lock = threading.Lock()
+        self.tables = {}
+        self.hits = count(1)
+        self.reset()
+
+    def reset(self: PredicateCache) -> None:
+        """
+        reset is a method that drops all outcomes and sets all counters to zero.
+        Tables are cleared in place, so memoized tests keep using them.
+        """
+        with self.lock:
+            for table in self.tables.values():
+                table.clear()
+
+            self.base = counted(self.hits)
+            self.misses = 0
+
+    def memoize(self: PredicateCache, argname: str, failif: Callable) -> Callable:
+        """
+        memoize is a method that wraps test for argument argname with the cache.
+        Outcome is kept with type of value, so equal values of other types (1 and True)
+        are tested again.
+
+        Args:
+            argname (str): name of the argument.
+            failif (Callable): lambda that fails if arg fails.
+
+        Returns:
+            Callable: lambda with the same interface that caches outcomes.
+        """
+        table = self.tables.setdefault(argname, OrderedDict())
+        get = table.get
+        touch = table.move_to_end
+        hit = self.hits.__next__
+        clock = time.monotonic
+        lock = self.lock
+        maxsize = self.maxsize
+        ttl = self.ttl
+
+        def on_fail(arg: Any, criteria: Any) -> bool:
+            try:
+                entry = get(arg)
+            except TypeError:
+                return failif(arg, criteria)
+
+            if entry is not None and entry[1] is type(arg) and (entry[2] is None or entry[2] > clock()):
+                hit()
+
+                try:
+                    touch(arg)
+                except KeyError:
+                    pass
+
+                return entry[0]
+
+            failed = failif(arg, criteria)
+
+            with lock:
+                self.misses += 1
+                table[arg] = (failed, type(arg), None if ttl is None else clock() + ttl)
+                table.move_to_end(arg)
+
+                if len(table) > maxsize:
+                    table.popitem(last=False)
+
+            return failed
+
+        return on_fail
+
+    def stats(self: PredicateCache) -> dict:
+        """
+        stats is a method that returns counters of the cache.
+
+        Returns:
+            dict: hits, misses and current size.
+        """
+        size = sum(len(table) for table in list(self.tables.values()))
+        return {'hits': counted(self.hits) - self.base, 'misses': self.misses, 'size': size}
+
+
+def cachestats() -> dict:
+    """
+    cachestats is a function that returns counters of all registered caches.
+
+    Returns:
+        dict: {function name: {'hits': ..., 'misses': ..., 'size': ...}}.
+    """
+    return {name: cache.stats() for (name, cache) in CACHES.items()}
+
+
+def argplan(func: Callable, argchecks: dict) -> list:
+    """
+    argplan is a function that resolves checked arguments to their places once.
+
+    Args:
+        func (Callable): decorated function.
+        argchecks (dict): arguments for checking.
+
+    Returns:
+        list: (argname, kind, position, criteria) for every check, where kind is
+              'positional', 'keyword' (keyword-only or caught by **kwargs),
+              'varargs' (name of *args) or 'varkw' (name of **kwargs).
+    """
+    code = unwrap(func).__code__
+    names = code.co_varnames
+    nargs = code.co_argcount + code.co_kwonlyargcount
+    positionals = names[:code.co_argcount]
+    varargs = names[nargs] if code.co_flags & CO_VARARGS else None
+    varkw = names[nargs + bool(varargs)] if code.co_flags & CO_VARKEYWORDS else None
+    plan = []
+
+    for (argname, criteria) in argchecks.items():
+        if argname in positionals:
+            plan.append((argname, 'positional', positionals.index(argname), criteria))
+        elif argname == varargs:
+            plan.append((argname, 'varargs', code.co_argcount, criteria))
+        elif argname == varkw:
+            plan.append((argname, 'varkw', None, criteria))
+        else:
+            plan.append((argname, 'keyword', None, criteria))
+
+    return plan
+
+
+def compile_checker(func: Callable, argchecks: dict, failif: Callable, on_error: Callable,
+                    sampler: Sampler = None, cache: PredicateCache = None, hook: bool = False) -> Callable:
+    """
+    compile_checker is a function that builds wrapper specialized for signature of func.
+    Every check is unrolled into its own branch with constant position, so call costs
+    one dict lookup and one index per checked argument. Check for name of *args applies
+    to every extra positional and check for name of **kwargs applies to every extra
+    keyword. Arguments that are not passed (defaults) are not checked.
+
+    Args:
+        func (Callable): decorated function.
+        argchecks (dict): arguments for checking.
+        failif (Callable): lambda that fails if arg fails.
+        on_error (Callable): function that raises an Exception.
+        sampler (Sampler, optional): sampler that decides whether call is checked, its counter
+                                     and every are inlined. Defaults to None.
+        cache (PredicateCache, optional): cache of test outcomes. Defaults to None.
+        hook (bool, optional): build pre-hook on_call(pargs, kwargs) that only checks
+                               arguments and doesn't call func. Defaults to False.
+
+    Returns:
+        Callable: wrapper for decorated function or pre-hook.
+    """
+    namespace = {'func': func, 'on_error': on_error}
+    lines = ['def on_call(pargs, kwargs):' if hook else 'def on_call(*pargs, **kwargs):']
+    call = 'None' if hook else 'func(*pargs, **kwargs)'
+    plan = argplan(func, argchecks)
+    code = unwrap(func).__code__
+    named = set(code.co_varnames[:code.co_argcount + code.co_kwonlyargcount])
+    namespace['named'] = named
+
+    if sampler is not None:
+        namespace['calls'] = sampler.calls
+        namespace['admitted'] = sampler.admitted
+        lines.append(f'    if next(calls) % {int(sampler.every)} or not admitted():')
+        lines.append(f'        return {call}')
+
+    for (index, (argname, kind, position, criteria)) in enumerate(plan):
+        namespace[f'criteria{index}'] = criteria
+        if isinstance(criteria, each):
+            namespace[f'failif{index}'] = criteria.failif(failif)
+        elif cache is not None:
+            namespace[f'failif{index}'] = cache.memoize(argname, failif)
+        else:
+            namespace[f'failif{index}'] = failif
+
+        fail = f'on_error({argname!r}, criteria{index})'
+
+        if kind == 'varargs':
+            lines.append(f'    for arg in pargs[{position}:]:')
+            lines.append(f'        if failif{index}(arg, criteria{index}):')
+            lines.append(f'            {fail}')
+        elif kind == 'varkw':
+            lines.append('    for (name, arg) in kwargs.items():')
+            lines.append(f'        if name not in named and failif{index}(arg, criteria{index}):')
+            lines.append(f'            {fail}')
+        else:
+            lines.append(f'    if {argname!r} in kwargs:')
+            lines.append(f'        if failif{index}(kwargs[{argname!r}], criteria{index}):')
+            lines.append(f'            {fail}')
+
+            if kind == 'positional':
+                lines.append(f'    elif len(pargs) > {position}:')
+                lines.append(f'        if failif{index}(pargs[{position}], criteria{index}):')
+                lines.append(f'            {fail}')
+
+    lines.append(f'    return {call}')
+    exec('\n'.join(lines), namespace)
+
+    on_call = namespace['on_call']
+    on_call.__doc__ = 'on_call is a wrapper for decorated function.'
+    on_call.__name__ = func.__name__
+    on_call.__qualname__ = func.__qualname__
+    on_call.__wrapped__ = func
+    return on_call
+
+
+def argtest(argchecks: dict, failif: Callable, sampler: Sampler = None,
+            cache: PredicateCache = None) -> Callable:
     """
     argtest is a wrapper for original decorator.
 
     Args:
         argchecks (dict): arguments for checking.
         failif (Callable): lambda that fails if arg fails.
+        sampler (Sampler, optional): sampling mode, every call is checked if None. Defaults to None.
+        cache (PredicateCache, optional): cache of test outcomes or None. Defaults to None.
 
     Returns:
         Callable: original decorator.
     """
+    def on_compile(func: Callable, hook: bool) -> Callable:
+        """
+        on_compile is a function that compiles checks for func.
+
+        Args:
+            func (Callable): decorated function.
+            hook (bool): build pre-hook instead of wrapper.
+
+        Returns:
+            Callable: wrapper for decorated function or pre-hook.
+        """
+        def on_error(argname: str, criteria: tuple) -> None:
+            """
+            on_error is a function that raise an Exception.
+
+            Args:
+                argname (str): name of the argument that don't pass.
+                criteria (tuple): range where the value of the argument must be.
+
+            Raises:
+                TypeError: exception when argument fails.
+            """
+            if sampled is not None:
+                with sampled.lock:
+                    sampled.failed += 1
+
+            raise TypeError(f'{func.__name__} argument "{argname}" not {criteria}')
+
+        name = f'{func.__module__}.{func.__qualname__}'
+        sampled = None
+        cached = None
+
+        if sampler is not None:
+            sampled = Sampler(sampler.every, sampler.per_second, name)
+            SAMPLERS[sampled.name] = sampled
+
+        if cache is not None:
+            cached = PredicateCache(cache.maxsize, cache.ttl, name)
+            CACHES[cached.name] = cached
+
+        on_call = compile_checker(func, argchecks, failif, on_error, sampled, cached, hook)
+        on_call.sampler = sampled
+        on_call.cache = cached
+        return on_call
+
     def on_decorator(func: Callable) -> Union[Callable, Any]:
         """
         on_decorator is a original decorator.
@@ -62,73 +545,64 @@ def argtest(argchecks: dict, failif: Callable) -> Callable:
         if not __debug__:
             return func
         else:
-            code = func.__code__
-            parameters = list(code.co_varnames[:code.co_argcount])
-
-            def on_error(argname: str, criteria: tuple) -> None:
-                """
-                on_error is a function that raise an Exception.
-
-                Args:
-                    argname (str): name of the argument that don't pass.
-                    criteria (tuple): range where the value of the argument must be.
-
-                Raises:
-                    TypeError: exception when argument fails.
-                """
-                raise TypeError(f'{func.__name__} argument "{argname}" not {criteria}')
-
-            def on_call(*pargs: tuple, **kwargs: dict) -> Any:
-                """
-                on_call is a wrapper for decorated function.
-
-                Returns:
-                    Any: result of the decorated function.
-                """
-                positionals = parameters[:len(pargs)]
-
-                for (argname, criteria) in argchecks.items():
-                    if argname in kwargs:
-                        if failif(kwargs[argname], criteria):
-                            on_error(argname, criteria)
-                    elif argname in positionals:
-                        position = positionals.index(argname)
-
-                        if failif(pargs[position], criteria):
-                            on_error(argname, criteria)
-                return func(*pargs, **kwargs)
-            return on_call
+            return on_compile(func, False)
+
+    def hooks(func: Callable) -> tuple:
+        """
+        hooks is a function that implements hooks protocol of classtools.autod.fuse:
+        pre-hook checks arguments, there is no post-hook.
+
+        Args:
+            func (Callable): decorated function.
+
+        Returns:
+            tuple: (pre-hook or None, None).
+        """
+        return (on_compile(func, True) if __debug__ else None, None)
+
+    on_decorator.hooks = hooks
     return on_decorator
 
 
-def rangetest(**argchecks: dict) -> Union[Callable, Any]:
+def rangetest(sampler: Sampler = None, /, **argchecks: dict) -> Union[Callable, Any]:
     """
     rangetest is a function that defines range tests.
 
+    Args:
+        sampler (Sampler, optional): sampling mode, every call is checked if None. Defaults to None.
+
     Returns:
         Union[Callable, Any]: if __debug__ then decorated function
                               otherwise result of the decorated function.
     """
-    return argtest(argchecks, lambda arg, vals: arg < vals[0] or arg > vals[1])
+    return argtest(argchecks, outofrange, sampler)
 
 
-def typetest(**argchecks: dict) -> Union[Callable, Any]:
+def typetest(sampler: Sampler = None, /, **argchecks: dict) -> Union[Callable, Any]:
     """
     typetest is a function that defines type tests.
 
+    Args:
+        sampler (Sampler, optional): sampling mode, every call is checked if None. Defaults to None.
+
     Returns:
         Union[Callable, Any]: if __debug__ then decorated function
                               otherwise result of the decorated function.
     """
-    return argtest(argchecks, lambda arg, type: not isinstance(arg, type))
+    return argtest(argchecks, nottype, sampler)
 
 
-def valuetest(**argchecks: dict) -> Union[Callable, Any]:
+def valuetest(sampler: Sampler = None, cache: PredicateCache = None, /,
+              **argchecks: dict) -> Union[Callable, Any]:
     """
     valuetest is a function that defines value tests.
 
+    Args:
+        sampler (Sampler, optional): sampling mode, every call is checked if None. Defaults to None.
+        cache (PredicateCache, optional): cache of test outcomes or None. Defaults to None.
+
     Returns:
         Union[Callable, Any]: if __debug__ then decorated function
                               otherwise result of the decorated function.
     """
-    return argtest(argchecks, lambda arg, tester: not tester(arg))
+    return argtest(argchecks, nottrue, sampler, cache)
@@ -0,0 +1,24 @@
+#! /usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+attrtools: Instruments for displaying, mapping and hiding attributes.
+Submodules and names are imported on first access (PEP 562).
+"""
+
+
+from moduletools.lazy import lazymodule
+
+
+(__getattr__, __dir__, __all__) = lazymodule(__name__, ['attrdisplay', 'mapattrs', 'privacy'], {
+    'AttrDisplayR': 'attrdisplay',
+    'AttrDisplayI': 'attrdisplay',
+    'AttrDisplayL': 'attrdisplay',
+    'AttrDisplayT': 'attrdisplay',
+    'AttrDisplayD': 'attrdisplay',
+    'asdicts': 'attrdisplay',
+    'dumps': 'attrdisplay',
+    'dumpsmany': 'attrdisplay',
+    'mapattrs_many': 'mapattrs',
+    'private': 'privacy',
+    'public': 'privacy',
+})
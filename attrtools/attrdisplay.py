@@ -6,7 +6,191 @@ attrdisplay.py: Provides classes which manage classes attributes.
 
 
 from __future__ import annotations
-from typing import Any, Type
+from typing import Any, Type, Callable, Iterator
+from types import ModuleType
+from operator import attrgetter
+from functools import lru_cache
+import threading
+import keyword
+import reprlib
+import json
+import sys
+
+
+PLANSIZE = 4096
+PLANS = {}
+SERIALIZERS = {}
+SCALARS = frozenset([str, int, float, bool, type(None)])
+RENDERING = threading.local()
+
+
+@lru_cache(maxsize=1024)
+def slotnames(aClass: Type) -> tuple:
+    """
+    slotnames: Returns names of all __slots__ declared in class and its superclasses.
+    Private names (__x) are mangled with name of the class which declares them.
+    """
+    names = []
+
+    for cls in aClass.__mro__:
+        slots = vars(cls).get('__slots__', ())
+        for name in (slots,) if isinstance(slots, str) else slots:
+            if name.startswith('__') and not name.endswith('__') and cls.__name__.lstrip('_'):
+                name = f'_{cls.__name__.lstrip("_")}{name}'
+            if name not in ('__dict__', '__weakref__') and name not in names:
+                names.append(name)
+
+    return tuple(names)
+
+
+def compileplan(keys: tuple) -> Callable:
+    """
+    compileplan: Returns formatting plan for the set of attribute names keys.
+    The plan is a function which renders 'key=value, ...' sorted by key
+    with one attrgetter call and one str.format call.
+    """
+    keys = sorted(keys)
+
+    if not keys:
+        return lambda obj: ''
+
+    template = ', '.join(key.replace('{', '{{').replace('}', '}}') + '={}' for key in keys)
+    fmt = template.format
+    getter = attrgetter(*keys)
+
+    if len(keys) == 1:
+        return lambda obj: fmt(getter(obj))
+
+    return lambda obj: fmt(*getter(obj))
+
+
+def attrkeys(obj: Any) -> tuple:
+    """
+    attrkeys: Returns names of instance attributes of obj (its __dict__ and set __slots__).
+    """
+    keys = tuple(getattr(obj, '__dict__', ()))
+    slots = slotnames(type(obj))
+
+    if slots:
+        keys += tuple(name for name in slots if hasattr(obj, name))
+
+    return keys
+
+
+def gatherattrs(obj: Any) -> str:
+    """
+    gatherattrs: Returns 'key=value, ...' for instance attributes of obj (its __dict__
+    and set __slots__). Plans are cached by the set of names, so sorting and
+    building of the template happens only when the set of names changes.
+    """
+    keys = attrkeys(obj)
+
+    try:
+        plan = PLANS[keys]
+    except KeyError:
+        if len(PLANS) >= PLANSIZE:
+            PLANS.clear()
+        plan = PLANS[keys] = compileplan(keys)
+
+    return plan(obj)
+
+
+def compileserializer(keys: tuple) -> Callable:
+    """
+    compileserializer: Returns generated function which converts instance with
+    attribute names keys to dict {key: value} sorted by key, with one direct
+    attribute fetch per key and values converted by toplain.
+    """
+    fetches = []
+
+    for key in sorted(keys):
+        if key.isidentifier() and not keyword.iskeyword(key):
+            fetches.append(f'{key!r}: toplain(obj.{key}, seen)')
+        else:
+            fetches.append(f'{key!r}: toplain(getattr(obj, {key!r}), seen)')
+
+    namespace = {'toplain': toplain}
+    exec(f'def serializer(obj, seen):\n    return {{{", ".join(fetches)}}}', namespace)
+    return namespace['serializer']
+
+
+def toplain(value: Any, seen: set) -> Any:
+    """
+    toplain: Converts value to JSON-compatible value. Containers are converted
+    recursively, objects with attributes are converted to dicts by asdict, objects
+    that are already being converted (reference cycles) become '<cycle>' and
+    everything else becomes str(value).
+    """
+    if type(value) in SCALARS:
+        return value
+    if isinstance(value, (dict, list, tuple, set, frozenset)):
+        if id(value) in seen:
+            return '<cycle>'
+
+        seen.add(id(value))
+
+        try:
+            if isinstance(value, dict):
+                return {key if type(key) in SCALARS else str(key): toplain(item, seen) for (key, item) in value.items()}
+            return [toplain(item, seen) for item in value]
+        finally:
+            seen.discard(id(value))
+    if isinstance(value, (type, ModuleType)) or callable(value):
+        return str(value)
+    if hasattr(value, '__dict__') or slotnames(type(value)):
+        return asdict(value, seen)
+    return str(value)
+
+
+def asdict(obj: Any, seen: set = None) -> dict:
+    """
+    asdict: Returns the same attributes which AttrDisplayR shows as JSON-compatible dict.
+    Serializer functions are generated once per set of attribute names and cached.
+        1) obj - any instance.
+        2) seen - ids of objects being converted, used to cut reference cycles.
+    """
+    seen = set() if seen is None else seen
+
+    if id(obj) in seen:
+        return '<cycle>'
+
+    keys = attrkeys(obj)
+
+    try:
+        serializer = SERIALIZERS[keys]
+    except KeyError:
+        if len(SERIALIZERS) >= PLANSIZE:
+            SERIALIZERS.clear()
+        serializer = SERIALIZERS[keys] = compileserializer(keys)
+
+    seen.add(id(obj))
+
+    try:
+        return serializer(obj, seen)
+    finally:
+        seen.discard(id(obj))
+
+
+def asdicts(objs: Any) -> list:
+    """
+    asdicts: Returns list of asdict results for all objs in one pass.
+    """
+    seen = set()
+    return [asdict(obj, seen) for obj in objs]
+
+
+def dumps(obj: Any) -> bytes:
+    """
+    dumps: Returns asdict result of obj as compact JSON bytes.
+    """
+    return json.dumps(asdict(obj), separators=(',', ':'), ensure_ascii=False).encode('UTF-8')
+
+
+def dumpsmany(objs: Any) -> bytes:
+    """
+    dumpsmany: Returns asdicts result of objs as compact JSON array bytes.
+    """
+    return json.dumps(asdicts(objs), separators=(',', ':'), ensure_ascii=False).encode('UTF-8')
 
 
 class AttrDisplayR:
@@ -15,9 +199,10 @@ class AttrDisplayR:
     which uses __gatherAttrs method for gathering attributes. It gathers only
     object attributes (not from its Class or Superclass). That's because
     self.__dict__ contains only objects attributes (not object parent's attrs).
+    Attributes from __slots__ are gathered too.
     """
     def __gatherAttrs(self: AttrDisplayR) -> str:
-        return ', '.join([f'{key}={getattr(self, key)}' for key in sorted(self.__dict__)])
+        return gatherattrs(self)
 
     def __repr__(self: AttrDisplayR) -> str:
         return f'[{self.__class__.__name__}: {self.__gatherAttrs()}]'
@@ -29,9 +214,10 @@ class AttrDisplayI:
     which uses __attrnames method for gathering attributes. It gathers only
     object attributes (not from its Class or Superclass). That's because
     self.__dict__ contains only objects attributes (not object parent's attrs).
+    Attributes from __slots__ are gathered too.
     """
     def __attrnames(self: AttrDisplayI) -> str:
-        return ', '.join([f'{key}={getattr(self, key)}' for key in sorted(self.__dict__)])
+        return gatherattrs(self)
 
     def __str__(self: AttrDisplayI) -> str:
         return f'[Instance of {self.__class__.__name__} at {hex(id(self))}: {self.__attrnames()}]'
@@ -43,30 +229,73 @@ class AttrDisplayL:
     which uses __attrnames method for gathering attributes. It gathers object
     attributes, its class attributes and attributes from all classes inherited
     by its class. That's because dir's used there instead of __dict__.
+    It also provides render method, which streams the same output line by line
+    to a file with truncated values and a total size budget.
     """
-    def __attrnames(self: AttrDisplayL) -> str:
-        inner_border = '*' * 47 + 'Inners' + '*' * 47 + '\n'
-        other_bother = '*' * 47 + 'Others' + '*' * 47 + '\n'
+    def __lines(self: AttrDisplayL, valuefmt: Callable) -> Iterator:
+        chapter = f'Instance of {self.__class__.__name__} at {hex(id(self))}'
+        yield f'{chapter:^100}\n'
+        yield '*' * 47 + 'Inners' + '*' * 47 + '\n'
 
-        inners = [x for x in dir(self) if x.startswith('__') and x.endswith('__')]
-        others = [x for x in dir(self) if x not in inners]
+        names = dir(self)
+        inners = [x for x in names if x.startswith('__') and x.endswith('__')]
 
-        inners = [f'{x:^20}' + '\n' if i % 5 == 4 else f'{x:^20}' for i, x in enumerate(inners)]
-        others = [f'{i + 1:>4}){x:^48}{str(getattr(self, x)):^48}\n' for i, x in enumerate(others)]
+        for i in range(0, len(inners), 5):
+            yield ''.join(f'{x:^20}' for x in inners[i:i + 5]) + '\n'
 
-        if '\n' not in inners[-1]:
-            inners[-1] += '\n'
+        yield '*' * 47 + 'Others' + '*' * 47 + '\n'
+        inners = set(inners)
 
-        inners = ''.join(inners)
-        others = ''.join(others)
+        for i, x in enumerate(x for x in names if x not in inners):
+            try:
+                value = valuefmt(getattr(self, x))
+            except Exception as error:
+                value = f'<{type(error).__name__}: {error}>'
+            yield f'{i + 1:>4}){x:^48}{value:^48}\n'
 
-        return inner_border + inners + other_bother + others
+    def __attrnames(self: AttrDisplayL) -> str:
+        return ''.join(self.__lines(str))
 
     def __str__(self: AttrDisplayL) -> str:
-        chapter = f'Instance of {self.__class__.__name__} at {hex(id(self))}'
-        chapter = f'{chapter:^100}'
-        attributes = f'\n{self.__attrnames()}'
-        return chapter + attributes
+        active = RENDERING.__dict__.setdefault('active', set())
+
+        if id(self) in active:
+            return f'<cycle: {self.__class__.__name__} at {hex(id(self))}>'
+
+        active.add(id(self))
+
+        try:
+            return self.__attrnames()
+        finally:
+            active.discard(id(self))
+
+    def render(self: AttrDisplayL, file: Any = None, budget: int = 65536, maxvalue: int = 48) -> int:
+        """
+        render: Writes output of __str__ to file line by line without building one string.
+        Values are rendered with reprlib, so big containers are truncated to maxvalue
+        chars and reference cycles are cut, and output stops when budget is exceeded.
+            1) file - stream to write to (sys.stdout by default).
+            2) budget - max number of chars to write or None for unlimited.
+            3) maxvalue - max number of chars for a value.
+        Returns number of written chars.
+        """
+        file = file if file is not None else sys.stdout
+        shorten = reprlib.Repr()
+        shorten.maxstring = shorten.maxother = maxvalue
+        written = 0
+
+        def valuefmt(value: Any) -> str:
+            if isinstance(value, str):
+                return value if len(value) <= maxvalue else value[:maxvalue - 3] + '...'
+            return shorten.repr(value)
+
+        for line in self.__lines(valuefmt):
+            if budget is not None and written + len(line) > budget:
+                written += file.write(f'... truncated after {written} chars\n')
+                break
+            written += file.write(line)
+
+        return written
 
 
 class AttrDisplayT:
@@ -122,3 +351,16 @@ class AttrDisplayT:
         chapter = f'{chapter:-^100}'
         attrs = f'\n{self.__attrnames(self)}{self.__listclass(self.__class__)}'
         return chapter + attrs
+
+
+class AttrDisplayD:
+    """
+    AttrDisplayD: When inheriting, it provides structured output of the same
+    attributes which AttrDisplayR shows: asdict method returns JSON-compatible
+    dict and bytes(obj) returns compact JSON.
+    """
+    def asdict(self: AttrDisplayD) -> dict:
+        return asdict(self)
+
+    def __bytes__(self: AttrDisplayD) -> bytes:
+        return dumps(self)
@@ -9,6 +9,9 @@ from typing import Union, Any, Type
 import pprint
 
 
+CLASSMAPS = {}
+
+
 def trace(obj: Any, label: str = '', end: str = '\n') -> None:
     """
     trace: Provides beautiful output.
@@ -28,11 +31,20 @@ def invertdict(dict_: dict) -> dict:
     """
     invertdict: Inverts dict, where values become keys and keys become values.
     invertdict(dict(a=1, b=2, c=1)) => {1: ['a', 'c'], 2: ['b']}.
+    Groups keys in one pass over dict_.
     """
-    def keysof(value_: Any):
-        return sorted(key for key in dict_.keys() if dict_[key] == value_)
+    groups = {}
+
+    for (key, value) in dict_.items():
+        if value in groups:
+            groups[value].append(key)
+        else:
+            groups[value] = [key]
 
-    return {value: keysof(value) for value in set(dict_.values())}
+    for keys in groups.values():
+        keys.sort()
+
+    return groups
 
 
 def dflr(cls: Type) -> list:
@@ -59,6 +71,49 @@ def inheritance(instance: Any) -> Union[list, tuple]:
         return [instance] + dflr(instance.__class__)
 
 
+def classattrs(cls: Type, withobject: bool = False) -> dict:
+    """
+    classattrs: Returns dict {attr: class from which attr is inherited} for class cls
+    sorted by attr. Result is computed once per MRO and cached in CLASSMAPS, cache is
+    recomputed when set of names in __dict__ of any class in the MRO changes (attribute
+    added or deleted), names are compared as sets in C without rebuilding the maps.
+        1) cls - class.
+        2) withobject - with/without attributes from object class.
+    """
+    mro = cls.__mro__
+    entry = CLASSMAPS.get(mro)
+
+    if entry is None or not all(vars(sup).keys() == names for (sup, names) in zip(mro, entry[0])):
+        names = tuple(frozenset(vars(sup)) for sup in mro)
+        owners = {}
+
+        for sup in reversed(mro):
+            owners.update(dict.fromkeys(vars(sup), sup))
+
+        table = {attr: owners[attr] for attr in sorted(owners)}
+        notobject = filterdictvals(table, object)
+        entry = CLASSMAPS[mro] = (names, table, notobject, invertdict(table), invertdict(notobject))
+
+    return entry[1] if withobject else entry[2]
+
+
+def classsources(cls: Type, withobject: bool = False) -> dict:
+    """
+    classsources: Returns classattrs(cls, withobject) grouped by source class
+    (as invertdict does), computed once per MRO as well.
+    """
+    classattrs(cls, withobject)
+    entry = CLASSMAPS[cls.__mro__]
+    return entry[3] if withobject else entry[4]
+
+
+def clearcache() -> None:
+    """
+    clearcache: Drops all cached class-level maps.
+    """
+    CLASSMAPS.clear()
+
+
 def mapattrs(instance: Any, withobject: bool = False, bysource: bool = False) -> dict:
     """
     mapattrs: Returns dict with keys, which represent inherited attributes of instance and values
@@ -66,17 +121,50 @@ def mapattrs(instance: Any, withobject: bool = False, bysource: bool = False) ->
         1) instance - instance.
         2) withobject - with/without attributes from object class.
         3) bysource - group by object/attributes (default by attributes).
+    Class-level part is taken from classattrs cache, so only instance __dict__
+    is processed for every instance.
+    """
+    table = classattrs(instance.__class__, withobject)
+    own = getattr(instance, '__dict__', None)
+
+    if bysource:
+        sources = classsources(instance.__class__, withobject)
+
+        if not own:
+            return {source: list(attrs) for (source, attrs) in sources.items()}
+
+        obj2attrs = {instance: sorted(own)}
+
+        for (source, attrs) in sources.items():
+            attrs = [attr for attr in attrs if attr not in own]
+            if attrs:
+                obj2attrs[source] = attrs
+
+        return obj2attrs
+
+    if own:
+        return {attr: instance if attr in own else table[attr] for attr in sorted(table.keys() | own.keys())}
+
+    return dict(table)
+
+
+def mapattrs_many(instances: Any, withobject: bool = False, bysource: bool = False) -> dict:
+    """
+    mapattrs_many: Returns mapattrs results for many instances grouped by their class:
+    {class: [mapattrs(instance) for every instance of class in order]}. Class-level
+    work is done once per class, so only instance __dict__ is processed for each instance.
+        1) instances - iterable of instances.
+        2) withobject - with/without attributes from object class.
+        3) bysource - group by object/attributes (default by attributes).
     """
-    attr2obj = {}
-    inherits = inheritance(instance)
+    groups = {}
 
-    for attr in dir(instance):
-        for obj in inherits:
-            if hasattr(obj, '__dict__') and attr in obj.__dict__:
-                attr2obj[attr] = obj
-                break
+    for instance in instances:
+        cls = instance.__class__
 
-    if not withobject:
-        attr2obj = filterdictvals(attr2obj, object)
+        if cls in groups:
+            groups[cls].append(mapattrs(instance, withobject, bysource))
+        else:
+            groups[cls] = [mapattrs(instance, withobject, bysource)]
 
-    return attr2obj if not bysource else invertdict(attr2obj)
+    return groups
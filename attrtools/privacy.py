@@ -38,10 +38,29 @@ print(mark.age)
 mark.name = 'Not Mark'
 print(mark)
 # print(mark.job)
+
+
+@private('age', proxy=False)
+class Person3:
+    __slots__ = ('name', 'age')
+
+    def __init__(self, name, age):
+        self.name = name
+        self.age = age
+
+
+mark = Person3('mark', 22)
+print(mark.name)
+# print(mark.age)
 """
 
 
 from typing import Callable, Type, Any
+from types import CodeType, FunctionType, WrapperDescriptorType, MethodDescriptorType
+import sys
+
+
+HIDDEN = '<private>'
 
 
 class BuiltinsMixin:
@@ -64,8 +83,8 @@ class BuiltinsMixin:
         'ne', 'gt', 'ge', 'hash', 'bool', 'len', 'call',
         'getitem', 'setitem', 'delitem', 'iter', 'next',
         'reversed', 'contains', 'add', 'sub', 'mul', 'truediv',
-        'floordiv', 'mod', 'divmod', 'pow', 'lshift', 'rshifh',
-        'and', 'or', 'radd', 'rsub', 'rmul', 'rtruediv',
+        'floordiv', 'mod', 'divmod', 'pow', 'lshift', 'rshift',
+        'and', 'or', 'xor', 'radd', 'rsub', 'rmul', 'rtruediv',
         'rfloordiv', 'rmod', 'rdivmod', 'rpow', 'rlshift',
         'rrshift', 'rand', 'ror', 'rxor', 'iadd', 'isub',
         'imul', 'itruediv', 'ifloordiv', 'imod', 'ipow',
@@ -77,6 +96,215 @@ class BuiltinsMixin:
     for attr in builtins:
         exec(f'__{attr}__ = ProxyDesc("__{attr}__")')
 
+    @staticmethod
+    def forward(aClass: Type, attrname: str) -> Any:
+        """
+        forward is a method that binds __x__ method of Wrapper directly to the method
+        of underlying class, so call doesn't go through ProxyDesc and __getattr__.
+
+        Args:
+            aClass (Type): underlying class.
+            attrname (str): name of __x__ method.
+
+        Returns:
+            Any: function, None for unhashable classes or ProxyDesc as fallback.
+        """
+        method = getattr(aClass, attrname, BuiltinsMixin.ProxyDesc)
+
+        if method is None:
+            return None
+
+        if not isinstance(method, (FunctionType, WrapperDescriptorType, MethodDescriptorType)):
+            return BuiltinsMixin.ProxyDesc(attrname)
+
+        def on_call(self: Type, *args: tuple, **kwargs: dict) -> Any:
+            return method(self._wrapped, *args, **kwargs)
+
+        on_call.__name__ = attrname
+        return on_call
+
+
+class GuardDesc:
+    """
+    GuardDesc is a descriptor class that guards concrete private attribute of the class
+    itself (without proxy). Access is allowed only from code of the class methods,
+    the value is stored in instance __dict__ or in replaced class attribute.
+    """
+    def __init__(self: Type, attrname: str, original: Any, codes: frozenset) -> None:
+        self.attrname = attrname
+        self.original = original
+        self.codes = codes
+        self.isdata = hasattr(type(original), '__set__')
+
+    def fetch(self: Type, instance: Any, owner: Type) -> Any:
+        if not self.isdata:
+            try:
+                return instance.__dict__[self.attrname]
+            except (KeyError, AttributeError):
+                if self.original is GuardDesc:
+                    raise AttributeError(self.attrname) from None
+        if hasattr(type(self.original), '__get__'):
+            return self.original.__get__(instance, owner)
+        return self.original
+
+    def store(self: Type, instance: Any, value: Any) -> None:
+        if self.isdata:
+            self.original.__set__(instance, value)
+        else:
+            instance.__dict__[self.attrname] = value
+
+    def __get__(self: Type, instance: Any, owner: Type) -> Any:
+        if instance is None:
+            return self.original if self.original is not GuardDesc else self
+        if sys._getframe(1).f_code not in self.codes:
+            raise TypeError('private attribute fetch: ' + self.attrname)
+        return self.fetch(instance, owner)
+
+    def __set__(self: Type, instance: Any, value: Any) -> None:
+        if sys._getframe(1).f_code not in self.codes:
+            raise TypeError('private attribute change: ' + self.attrname)
+        self.store(instance, value)
+
+    def __delete__(self: Type, instance: Any) -> None:
+        if sys._getframe(1).f_code not in self.codes:
+            raise TypeError('private attribute change: ' + self.attrname)
+        if self.isdata:
+            self.original.__delete__(instance)
+        else:
+            del instance.__dict__[self.attrname]
+
+
+def class_codes(aClass: Type) -> frozenset:
+    """
+    class_codes is a function that collects code objects of all methods of the class
+    and its superclasses, including nested functions and comprehensions. Methods wrapped
+    by decorators are followed through __wrapped__ chains and functions in closure cells,
+    so original functions run by wrappers are allowed too.
+
+    Args:
+        aClass (Type): class whose methods are collected.
+
+    Returns:
+        frozenset: code objects which are allowed to access private attributes.
+    """
+    codes = set()
+    seen = set()
+    pending = []
+    functions = []
+
+    for cls in aClass.__mro__[:-1]:
+        for value in vars(cls).values():
+            pending.extend((value, getattr(value, 'fget', None), getattr(value, 'fset', None),
+                            getattr(value, 'fdel', None)))
+
+    while pending:
+        value = pending.pop()
+
+        if value is None or id(value) in seen:
+            continue
+
+        seen.add(id(value))
+        pending.extend((getattr(value, '__func__', None), getattr(value, '__wrapped__', None)))
+
+        if isinstance(value, FunctionType):
+            functions.append(value.__code__)
+
+            for cell in value.__closure__ or ():
+                try:
+                    contents = cell.cell_contents
+                except ValueError:
+                    continue
+                if callable(contents):
+                    pending.append(contents)
+
+    while functions:
+        code = functions.pop()
+        if code not in codes:
+            codes.add(code)
+            functions.extend(const for const in code.co_consts if isinstance(const, CodeType))
+
+    return frozenset(codes)
+
+
+def guard_control(privates: tuple = (), publics: tuple = None) -> Callable:
+    """
+    guard_control is a wrapper for decorator that enforces privacy without proxy.
+
+    Args:
+        privates (tuple, optional): private attributes. Defaults to ().
+        publics (tuple, optional): if not None, all attributes except these
+                                   and __x__ methods are private. Defaults to None.
+
+    Returns:
+        Callable: decorator.
+    """
+    def on_decorator(aClass: Type) -> Type:
+        """
+        on_decorator is a decorator that installs GuardDesc descriptors into the class.
+        Public attributes are not touched and work at native speed.
+
+        Args:
+            aClass (Type): class that should be decorated.
+
+        Raises:
+            TypeError: when trying to get access to private attributes.
+            TypeError: when trying to change value of private attributes.
+
+        Returns:
+            Type: the same class.
+        """
+        if not __debug__:
+            return aClass
+
+        codes = class_codes(aClass)
+
+        if publics is None:
+            names = set(privates)
+        else:
+            names = {
+                attr for cls in aClass.__mro__[:-1] for attr in vars(cls)
+                if attr not in publics and not (attr.startswith('__') and attr.endswith('__'))
+            }
+
+        guards = {}
+
+        for attr in names:
+            original = next((vars(cls)[attr] for cls in aClass.__mro__ if attr in vars(cls)), GuardDesc)
+            if isinstance(original, GuardDesc):
+                original = original.original
+            guards[attr] = GuardDesc(attr, original, codes)
+            setattr(aClass, attr, guards[attr])
+
+        if publics is not None:
+            publicset = frozenset(publics)
+            setter = aClass.__setattr__
+
+            def __setattr__(self: Any, attr: str, value: Any) -> None:
+                if attr in publicset:
+                    setter(self, attr, value)
+                elif sys._getframe(1).f_code not in codes:
+                    raise TypeError('private attribute change: ' + attr)
+                elif attr in guards:
+                    guards[attr].store(self, value)
+                else:
+                    self.__dict__.setdefault(HIDDEN, {})[attr] = value
+
+            def __getattr__(self: Any, attr: str) -> Any:
+                if attr in publicset or attr == HIDDEN:
+                    raise AttributeError(attr)
+                if sys._getframe(1).f_code not in codes:
+                    raise TypeError('private attribute fetch: ' + attr)
+                try:
+                    return self.__dict__[HIDDEN][attr]
+                except KeyError:
+                    raise AttributeError(attr) from None
+
+            aClass.__setattr__ = __setattr__
+            aClass.__getattr__ = __getattr__
+
+        return aClass
+    return on_decorator
+
 
 def access_control(fail_if: Callable) -> Callable:
     """
@@ -128,26 +356,45 @@ def access_control(fail_if: Callable) -> Callable:
                         raise TypeError('private attribute change: ' + attr)
                     else:
                         setattr(self._wrapped, attr, value)
+
+            for attr in BuiltinsMixin.builtins:
+                if not fail_if(f'__{attr}__'):
+                    setattr(Wrapper, f'__{attr}__', BuiltinsMixin.forward(aClass, f'__{attr}__'))
             return Wrapper
     return on_decorator
 
 
-def private(*attributes: tuple) -> Type:
+def private(*attributes: tuple, proxy: bool = True) -> Type:
     """
     private is a function that defines private decorator.
 
+    Args:
+        proxy (bool, optional): if False, privacy is enforced on the class itself
+                                via GuardDesc instead of Wrapper. Defaults to True.
+
     Returns:
         Type: wrapper for original decorator with the lambda for privacy.
     """
-    return access_control(fail_if=(lambda attr: attr in attributes))
+    if not proxy:
+        return guard_control(privates=attributes)
+    return access_control(fail_if=frozenset(attributes).__contains__)
 
 
-def public(*attributes: tuple) -> Type:
+def public(*attributes: tuple, proxy: bool = True) -> Type:
     """
     public is a function that defines public decorator.
 
+    Args:
+        proxy (bool, optional): if False, privacy is enforced on the class itself
+                                via GuardDesc instead of Wrapper. Defaults to True.
+
     Returns:
         Type: wrapper for original decorator with the lambda for publicity.
     """
     attributes = attributes + tuple([f'__{attr}__' for attr in BuiltinsMixin.builtins])
+
+    if not proxy:
+        return guard_control(publics=attributes)
+
+    attributes = frozenset(attributes)
     return access_control(fail_if=(lambda attr: attr not in attributes))
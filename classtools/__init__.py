@@ -0,0 +1,22 @@
+#! /usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+classtools: Metaclasses and instruments for exploring classes.
+Submodules and names are imported on first access (PEP 562).
+"""
+
+
+from moduletools.lazy import lazymodule
+
+
+(__getattr__, __dir__, __all__) = lazymodule(__name__, ['autod', 'classindex', 'classtree', 'profiler'], {
+    'decorate_all': 'autod',
+    'MetaDecorate': 'autod',
+    'ClassIndex': 'classindex',
+    'ClassGraph': 'classtree',
+    'classgraph': 'classtree',
+    'instancetree': 'classtree',
+    'instancetrees': 'classtree',
+    'profile_all': 'profiler',
+    'REGISTRY': 'profiler',
+})
@@ -26,21 +26,226 @@ class A(metaclass=MetaDecorate(decorators=[timer(trace=True), ])):
         print('hello')
 
 
+a = A()
+a.say_hello()
+
+UsageLazy:
+from timetools.timerd import timer
+
+
+class A(metaclass=MetaDecorate(decorators=[timer(trace=True)], lazy=True, exclude=['hot'])):
+    def say_hello(self):
+        print('hello')
+
+    def hot(self):
+        pass
+
+
 a = A()
 a.say_hello()
 """
 
 
-from typing import Type, Callable, Sequence
+from typing import Type, Callable, Sequence, Any, Union, Collection
 from types import FunctionType
 
 
-def decorate_all(decorator: Callable) -> Type:
+CLASS_HOOKS = []
+
+
+def created(cls: Type) -> Type:
+    """
+    created is a function that calls all CLASS_HOOKS for the class created by metaclasses.
+
+    Args:
+        cls (Type): created class.
+
+    Returns:
+        Type: the same class.
+    """
+    for hook in CLASS_HOOKS:
+        hook(cls)
+    return cls
+
+
+class Names(dict):
+    """
+    Names is a mapping for str.format_map, which makes placeholders of source hooks
+    unique for every hook: {name} becomes name_index, {result} stays result.
+    """
+    def __init__(self: Type, index: int) -> None:
+        super().__init__(result='result')
+        self.index = index
+
+    def __missing__(self: Type, name: str) -> str:
+        return f'{name}_{self.index}'
+
+
+def hooksource(hooks: Any) -> dict:
+    """
+    hooksource is a function that converts (pre, post) hooks to source form.
+
+    Args:
+        hooks (Any): (pre, post) or source form.
+
+    Returns:
+        dict: source form {'namespace': ..., 'pre': [...], 'post': [...], 'final': [...]}.
+    """
+    if isinstance(hooks, dict):
+        return hooks
+
+    (pre, post) = hooks
+    source = {'namespace': {'pre': pre, 'post': post}, 'pre': [], 'post': [], 'final': []}
+
+    if pre is not None:
+        source['pre'].append('{state} = {pre}(args, kwargs)')
+    elif post is not None:
+        source['pre'].append('{state} = None')
+
+    if post is not None:
+        source['post'].append('result = {post}({state}, result)')
+
+    return source
+
+
+def fuse(func: Callable, decorators: Sequence) -> Callable:
+    """
+    fuse is a function that compiles decorators which support hooks protocol into
+    one wrapper. Decorator supports protocol if it has hooks attribute, decorator.hooks(func)
+    returns one of:
+    1) (pre, post), where pre(args, kwargs) is called before func and returns state,
+       post(state, result) is called after func returned and returns result, any may be None;
+    2) source form {'namespace': {name: object}, 'pre': [lines], 'post': [lines], 'final': [lines]},
+       where lines are generated into the wrapper itself, so the hook costs no call.
+       Lines use {name} for objects of namespace and own locals ({state} keeps state),
+       'pre' lines run before func, 'post' lines after func returned (they may change result),
+       'final' lines run in finally, also when func raises.
+    Hooks of decorators applied later are outer: they are entered first and left last.
+
+    Args:
+        func (Callable): original function.
+        decorators (Sequence): decorators with hooks in order of applying.
+
+    Returns:
+        Callable: wrapper with hooks attribute (list of what hooks returned).
+    """
+    hooks = [decorator.hooks(func) for decorator in decorators]
+    sources = [hooksource(hook) for hook in hooks]
+    namespace = {'func': func}
+
+    def body(index: int, indent: str) -> list:
+        if index < 0:
+            return [f'{indent}result = func(*args, **kwargs)']
+
+        source = sources[index]
+        names = Names(index)
+        namespace.update((names[name], value) for (name, value) in source.get('namespace', {}).items())
+        lines = [indent + line.format_map(names) for line in source.get('pre', ())]
+
+        if source.get('final'):
+            lines.append(f'{indent}try:')
+            lines.extend(body(index - 1, indent + '    '))
+            lines.append(f'{indent}finally:')
+            lines.extend(f'{indent}    ' + line.format_map(names) for line in source['final'])
+        else:
+            lines.extend(body(index - 1, indent))
+
+        return lines + [indent + line.format_map(names) for line in source.get('post', ())]
+
+    lines = ['def on_call(*args, **kwargs):'] + body(len(sources) - 1, '    ') + ['    return result']
+    exec('\n'.join(lines), namespace)
+
+    on_call = namespace['on_call']
+    on_call.__name__ = func.__name__
+    on_call.__qualname__ = func.__qualname__
+    on_call.__doc__ = func.__doc__
+    on_call.__wrapped__ = func
+    on_call.hooks = hooks
+    return on_call
+
+
+def chain(func: Callable, decorators: Sequence) -> Callable:
+    """
+    chain is a function that applies decorators to func one by one (the last one is outer).
+    Consecutive decorators that support hooks protocol are fused into one wrapper,
+    single decorator is applied as is, fusing it would not save any call.
+
+    Args:
+        func (Callable): original function.
+        decorators (Sequence): decorators in order of applying.
+
+    Returns:
+        Callable: decorated function.
+    """
+    fusable = []
+
+    for decorator in list(decorators) + [None]:
+        if decorator is not None and hasattr(decorator, 'hooks'):
+            fusable.append(decorator)
+            continue
+
+        if len(fusable) > 1:
+            func = fuse(func, fusable)
+        elif fusable:
+            func = fusable[0](func)
+
+        fusable = []
+
+        if decorator is not None:
+            func = decorator(func)
+
+    return func
+
+
+class LazyDesc:
+    """
+    LazyDesc is a descriptor class that applies decorators to the method only when
+    the method is looked up first time, then replaces itself in the class
+    with the decorated method, so next lookups are ordinary.
+    """
+    def __init__(self: Type, func: Callable, decorators: Sequence) -> None:
+        self.func = func
+        self.decorators = decorators
+
+    def __set_name__(self: Type, owner: Type, name: str) -> None:
+        self.owner = owner
+        self.name = name
+
+    def __get__(self: Type, instance: Any, owner: Type) -> Any:
+        func = chain(self.func, self.decorators)
+        setattr(self.owner, self.name, func)
+        return func.__get__(instance, owner) if hasattr(type(func), '__get__') else func
+
+
+def selected(attr: str, include: Union[Collection, Callable], exclude: Union[Collection, Callable]) -> bool:
+    """
+    selected is a function that checks whether method attr should be decorated.
+
+    Args:
+        attr (str): name of the method.
+        include (Union[Collection, Callable]): names or predicate of methods to decorate, all if None.
+        exclude (Union[Collection, Callable]): names or predicate of methods not to decorate, none if None.
+
+    Returns:
+        bool: True if method should be decorated.
+    """
+    if include is not None and not (include(attr) if callable(include) else attr in include):
+        return False
+    if exclude is not None and (exclude(attr) if callable(exclude) else attr in exclude):
+        return False
+    return True
+
+
+def decorate_all(decorator: Callable, lazy: bool = False, include: Union[Collection, Callable] = None,
+                 exclude: Union[Collection, Callable] = None) -> Type:
     """
     decorate_all is a callable object that returns metaclass that applies decorator for all methods.
 
     Args:
         decorator (Callable): decorator what applies to all methods.
+        lazy (bool, optional): decorate method on its first lookup via LazyDesc. Defaults to False.
+        include (Union[Collection, Callable], optional): names or predicate of methods to decorate. Defaults to None.
+        exclude (Union[Collection, Callable], optional): names or predicate of methods to skip. Defaults to None.
 
     Returns:
         Type: metaclass
@@ -48,26 +253,39 @@ def decorate_all(decorator: Callable) -> Type:
     class MetaDecorate(type):
         def __new__(meta: Type, classname: str, supers: tuple, classdict: dict) -> Type:
             for attr, value in classdict.items():
-                if type(value) is FunctionType:
-                    classdict[attr] = decorator(value)
-            return type.__new__(meta, classname, supers, classdict)
+                if type(value) is FunctionType and selected(attr, include, exclude):
+                    classdict[attr] = LazyDesc(value, [decorator]) if lazy else decorator(value)
+            return created(type.__new__(meta, classname, supers, classdict))
     return MetaDecorate
 
 
 class MetaDecorate:
     """
     MetaDecorate is a metaclass that applies decorators for all methods.
+    Decorators are chained (the last one is outer), consecutive decorators
+    that support hooks protocol are fused into one wrapper (see fuse).
     """
-    def __init__(self: Type, decorators: Sequence) -> None:
+    def __init__(self: Type, decorators: Sequence, lazy: bool = False, include: Union[Collection, Callable] = None,
+                 exclude: Union[Collection, Callable] = None) -> None:
         """
         Args:
             decorators (Sequence): sequence of decorators what applies to all methods.
+            lazy (bool, optional): decorate method on its first lookup via LazyDesc. Defaults to False.
+            include (Union[Collection, Callable], optional): names or predicate of methods to decorate.
+                                                             Defaults to None.
+            exclude (Union[Collection, Callable], optional): names or predicate of methods to skip.
+                                                             Defaults to None.
         """
         self.decorators = decorators
+        self.lazy = lazy
+        self.include = include
+        self.exclude = exclude
 
     def __call__(self: Type, classname: str, supers: tuple, classdict: dict) -> Type:
         for attr, value in classdict.items():
-            if type(value) is FunctionType:
-                for decorator in self.decorators:
-                    classdict[attr] = decorator(value)
-        return type(classname, supers, classdict)
+            if type(value) is FunctionType and selected(attr, self.include, self.exclude):
+                if self.lazy:
+                    classdict[attr] = LazyDesc(value, self.decorators)
+                else:
+                    classdict[attr] = chain(value, self.decorators)
+        return created(type(classname, supers, classdict))
@@ -0,0 +1,153 @@
+#! /usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+classindex.py: Contains index of all loaded classes for fast "who defines X" queries.
+
+Usage:
+index = ClassIndex()
+index.watch()
+print(index.definers('__enter__'))
+print(index.overriders('__repr__', object))
+print(index.subclassesof(dict))
+"""
+
+
+from weakref import WeakKeyDictionary, WeakSet
+from typing import Type, Iterable
+from classtools.autod import CLASS_HOOKS
+
+
+class ClassIndex:
+    """
+    ClassIndex is an index of classes: attribute -> classes that define it in their
+    own __dict__ and class -> direct subclasses. It's built by one walk over
+    object.__subclasses__() tree, after that queries are dict lookups.
+    Index is updated incrementally by add (called automatically for classes created
+    by classtools.autod metaclasses after watch) and by refresh for other classes.
+    Classes are referenced weakly, so index doesn't keep dynamically created classes alive.
+    """
+    def __init__(self: Type, build: bool = True) -> None:
+        """
+        Args:
+            build (bool, optional): whether to index all loaded classes. Defaults to True.
+        """
+        self.attrs = {}
+        self.classattrs = WeakKeyDictionary()
+        self.subclasses = WeakKeyDictionary()
+
+        if build:
+            self.refresh()
+
+    def add(self: Type, cls: Type) -> None:
+        """
+        add is a method that adds (or reindexes) one class.
+
+        Args:
+            cls (Type): class to index.
+        """
+        for attr in self.classattrs.get(cls, ()):
+            self.attrs[attr].discard(cls)
+
+        names = tuple(vars(cls))
+        self.classattrs[cls] = names
+        self.subclasses.setdefault(cls, WeakSet())
+
+        for attr in names:
+            if attr in self.attrs:
+                self.attrs[attr].add(cls)
+            else:
+                self.attrs[attr] = WeakSet((cls,))
+
+        for base in cls.__bases__:
+            if base in self.subclasses:
+                self.subclasses[base].add(cls)
+            else:
+                self.subclasses[base] = WeakSet((cls,))
+
+    def refresh(self: Type, root: Type = object) -> int:
+        """
+        refresh is a method that walks __subclasses__ tree from root and adds
+        only classes which are not indexed yet.
+
+        Args:
+            root (Type, optional): root of the walk. Defaults to object.
+
+        Returns:
+            int: number of added classes.
+        """
+        added = 0
+        pending = [root]
+        visited = set()
+
+        while pending:
+            cls = pending.pop()
+
+            if cls in visited:
+                continue
+
+            visited.add(cls)
+
+            if cls not in self.classattrs:
+                self.add(cls)
+                added += 1
+
+            pending.extend(type.__subclasses__(cls))
+
+        return added
+
+    def watch(self: Type) -> None:
+        """
+        watch is a method that subscribes index to classes created by classtools.autod metaclasses.
+        """
+        if self.add not in CLASS_HOOKS:
+            CLASS_HOOKS.append(self.add)
+
+    def unwatch(self: Type) -> None:
+        """
+        unwatch is a method that unsubscribes index from classtools.autod metaclasses.
+        """
+        if self.add in CLASS_HOOKS:
+            CLASS_HOOKS.remove(self.add)
+
+    def definers(self: Type, attr: str) -> set:
+        """
+        definers is a method that returns classes which define attr in their own __dict__.
+        """
+        return set(self.attrs.get(attr, ()))
+
+    def subclassesof(self: Type, cls: Type, deep: bool = True) -> set:
+        """
+        subclassesof is a method that returns indexed subclasses of cls.
+
+        Args:
+            cls (Type): base class.
+            deep (bool, optional): all descendants or only direct subclasses. Defaults to True.
+        """
+        if not deep:
+            return set(self.subclasses.get(cls, ()))
+
+        found = set()
+        pending = [cls]
+
+        while pending:
+            for sub in self.subclasses.get(pending.pop(), ()):
+                if sub not in found:
+                    found.add(sub)
+                    pending.append(sub)
+
+        return found
+
+    def overriders(self: Type, attr: str, base: Type = None) -> set:
+        """
+        overriders is a method that returns classes which define attr while some class
+        later in their MRO defines it too (or only subclasses of base if it's given).
+        """
+        definers = set(self.attrs.get(attr, ()))
+        scope = definers if base is None else definers & self.subclassesof(base)
+        return {cls for cls in scope if any(sup in definers for sup in cls.__mro__[1:])}
+
+    def definersof(self: Type, attrs: Iterable) -> dict:
+        """
+        definersof is a method that returns {attr: definers(attr)} for many attrs.
+        """
+        return {attr: self.definers(attr) for attr in attrs}
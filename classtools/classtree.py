@@ -2,10 +2,148 @@
 # -*- coding: utf-8 -*-
 """
 classtree.py: Contains functions to print classes tree from class and instance.
+Trees are built by ClassGraph, which visits every class only once, so shared
+bases of diamond hierarchies are printed once and deep trees don't hit
+recursion limit. ClassGraph can also be exported to DOT and JSON.
+
+Usage:
+graph = classgraph(bool, dict, OrderedDict)
+graph.dot(open('classes.dot', 'w'))
+graph.json(open('classes.json', 'w'))
 """
 
 
-from typing import Any, Type
+from typing import Any, Type, Iterable, Iterator
+import json
+import sys
+
+
+class ClassGraph:
+    """
+    ClassGraph is a graph of classes where edges lead from class to its bases.
+    Every class is a node with its MRO. It's built iteratively, every class is
+    visited once.
+    """
+    def __init__(self: Type, classes: Iterable = ()) -> None:
+        """
+        Args:
+            classes (Iterable, optional): classes whose trees are added. Defaults to ().
+        """
+        self.roots = {}
+        self.nodes = {}
+        self.edges = []
+        self.add(*classes)
+
+    def add(self: Type, *classes: tuple) -> None:
+        """
+        add is a method that adds trees of classes to the graph.
+        """
+        for root in classes:
+            self.roots[root] = True
+            pending = [root]
+
+            while pending:
+                cls = pending.pop()
+
+                if cls in self.nodes:
+                    continue
+
+                self.nodes[cls] = cls.__mro__
+                self.edges.extend((cls, base) for base in cls.__bases__)
+                pending.extend(base for base in reversed(cls.__bases__) if base not in self.nodes)
+
+    @staticmethod
+    def name(cls: Type) -> str:
+        """
+        name is a method that returns unique name of the class.
+        """
+        return f'{cls.__module__}.{cls.__qualname__}'
+
+    def lines(self: Type, indent: int = 3) -> Iterator:
+        """
+        lines is a method that yields lines of text tree for every root.
+        Class that has already been printed is printed again with ' ^'
+        and its bases are not printed.
+
+        Args:
+            indent (int, optional): indentation for each new level. Defaults to 3.
+        """
+        printed = set()
+
+        for root in self.roots:
+            pending = [(root, 1)]
+
+            while pending:
+                (cls, level) = pending.pop()
+
+                if cls in printed:
+                    yield '.' * indent * level + cls.__name__ + ' ^'
+                    continue
+
+                printed.add(cls)
+                yield '.' * indent * level + cls.__name__
+                pending.extend((base, level + 1) for base in reversed(cls.__bases__))
+
+    def dot(self: Type, file: Any = None) -> None:
+        """
+        dot is a method that writes graph in DOT format to file line by line.
+
+        Args:
+            file (Any, optional): stream to write to. Defaults to sys.stdout.
+        """
+        file = file if file is not None else sys.stdout
+        file.write('digraph classes {\n    rankdir=BT;\n')
+
+        for cls in self.nodes:
+            file.write(f'    {json.dumps(self.name(cls))} [label={json.dumps(cls.__name__)}];\n')
+
+        for (cls, base) in self.edges:
+            file.write(f'    {json.dumps(self.name(cls))} -> {json.dumps(self.name(base))};\n')
+
+        file.write('}\n')
+
+    def node(self: Type, cls: Type) -> dict:
+        """
+        node is a method that returns JSON-compatible view of the class node.
+        """
+        return {
+            'name': cls.__name__,
+            'bases': [self.name(base) for base in cls.__bases__],
+            'mro': [self.name(sup) for sup in self.nodes[cls]],
+        }
+
+    def asdict(self: Type) -> dict:
+        """
+        asdict is a method that returns JSON-compatible view of the graph.
+        """
+        return {
+            'roots': [self.name(cls) for cls in self.roots],
+            'nodes': {self.name(cls): self.node(cls) for cls in self.nodes},
+        }
+
+    def json(self: Type, file: Any = None) -> None:
+        """
+        json is a method that writes graph in JSON format (as asdict returns)
+        to file node by node.
+
+        Args:
+            file (Any, optional): stream to write to. Defaults to sys.stdout.
+        """
+        file = file if file is not None else sys.stdout
+        file.write(f'{{"roots": {json.dumps([self.name(cls) for cls in self.roots])}, "nodes": {{')
+
+        for (count, cls) in enumerate(self.nodes):
+            file.write(f'{", " if count else ""}{json.dumps(self.name(cls))}: {json.dumps(self.node(cls))}')
+
+        file.write('}}\n')
+
+
+def classgraph(*classes: tuple) -> ClassGraph:
+    """
+    classgraph: Returns ClassGraph of classes.
+        1) classes - any classes.
+    """
+    return ClassGraph(classes)
 
 
 def classtree(cls: Type, indent: int = 3) -> None:
@@ -14,9 +152,8 @@ def classtree(cls: Type, indent: int = 3) -> None:
         1) cls - any class in a tree.
         2) indent - indentation for each new level.
     """
-    print('.' * indent + cls.__name__)
-    for supercls in cls.__bases__:
-        classtree(supercls, indent + 3)
+    for line in ClassGraph([cls]).lines(indent):
+        print(line)
 
 
 def instancetree(inst: Any, indent: int = 3) -> None:
@@ -27,3 +164,22 @@ def instancetree(inst: Any, indent: int = 3) -> None:
     """
     print(f'Tree of {inst}')
     classtree(inst.__class__, indent)
+
+
+def instancegraph(insts: Iterable) -> ClassGraph:
+    """
+    instancegraph: Returns ClassGraph of classes of instances,
+    every shared class is added once.
+        1) insts - iterable of any instances.
+    """
+    return ClassGraph(dict.fromkeys(inst.__class__ for inst in insts))
+
+
+def instancetrees(insts: Iterable, indent: int = 3) -> None:
+    """
+    instancetrees: Prints classes tree once for every class of instances.
+        1) insts - iterable of any instances.
+        2) indent - indentation for each new level.
+    """
+    for line in instancegraph(insts).lines(indent):
+        print(line)
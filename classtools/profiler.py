@@ -0,0 +1,203 @@
+#! /usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+profiler.py: Contains metaclass that profiles all methods of a class without printing.
+Per-method call counts, total/min/max time and latency histograms are collected in
+a central thread-safe Registry. When registry is disabled, methods only check one flag.
+
+Usage:
+class A(metaclass=profile_all()):
+    def say_hello(self):
+        return 'hello'
+
+
+a = A()
+a.say_hello()
+print(REGISTRY.snapshot())
+REGISTRY.export(open('profile.json', 'w'))
+REGISTRY.reset()
+"""
+
+
+from typing import Type, Callable, Any, Collection, Union
+from classtools.autod import decorate_all
+import threading
+import time
+import json
+import sys
+
+
+class MethodStats:
+    """
+    MethodStats is a class that keeps statistics of one method. Histogram bucket i
+    counts calls that took from 2 ** (i - 1) to 2 ** i nanoseconds.
+    """
+    __slots__ = ('calls', 'total', 'min', 'max', 'histogram', 'lock')
+
+    def __init__(self: Type) -> None:
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self: Type) -> None:
+        self.calls = 0
+        self.total = 0
+        self.min = None
+        self.max = 0
+        self.histogram = [0] * 64
+
+    def record(self: Type, elapsed: int) -> None:
+        with self.lock:
+            self.calls += 1
+            self.total += elapsed
+            self.histogram[min(elapsed.bit_length(), 63)] += 1
+
+            if self.min is None or elapsed < self.min:
+                self.min = elapsed
+            if elapsed > self.max:
+                self.max = elapsed
+
+    def snapshot(self: Type) -> dict:
+        with self.lock:
+            last = max((i for (i, count) in enumerate(self.histogram) if count), default=-1)
+            return {
+                'calls': self.calls,
+                'total_ns': self.total,
+                'min_ns': self.min,
+                'max_ns': self.max,
+                'mean_ns': self.total / self.calls if self.calls else None,
+                'histogram': self.histogram[:last + 1],
+            }
+
+
+class Registry:
+    """
+    Registry is a class that keeps MethodStats of all profiled methods of the process.
+    """
+    def __init__(self: Type, enabled: bool = True) -> None:
+        """
+        Args:
+            enabled (bool, optional): whether methods are measured. Defaults to True.
+        """
+        self.enabled = enabled
+        self.stats = {}
+        self.lock = threading.Lock()
+
+    def register(self: Type, name: str) -> MethodStats:
+        """
+        register is a method that returns MethodStats of method name, creating it if needed.
+        """
+        with self.lock:
+            if name not in self.stats:
+                self.stats[name] = MethodStats()
+            return self.stats[name]
+
+    def enable(self: Type) -> None:
+        self.enabled = True
+
+    def disable(self: Type) -> None:
+        self.enabled = False
+
+    def snapshot(self: Type) -> dict:
+        """
+        snapshot is a method that returns {method name: statistics} for all methods.
+        """
+        with self.lock:
+            stats = list(self.stats.items())
+        return {name: methodstats.snapshot() for (name, methodstats) in stats}
+
+    def reset(self: Type) -> None:
+        """
+        reset is a method that sets statistics of all methods to zero.
+        """
+        with self.lock:
+            stats = list(self.stats.values())
+        for methodstats in stats:
+            with methodstats.lock:
+                methodstats.reset()
+
+    def export(self: Type, file: Any = None) -> None:
+        """
+        export is a method that writes snapshot to file in JSON format.
+
+        Args:
+            file (Any, optional): stream to write to. Defaults to sys.stdout.
+        """
+        json.dump(self.snapshot(), file if file is not None else sys.stdout, indent=2)
+
+
+REGISTRY = Registry()
+
+
+def profile(registry: Registry = REGISTRY) -> Callable:
+    """
+    profile is a wrapper for original decorator to add parameters to decorator.
+    The decorator supports hooks protocol of classtools.autod.fuse.
+
+    Args:
+        registry (Registry, optional): registry for statistics. Defaults to REGISTRY.
+
+    Returns:
+        Callable: original decorator.
+    """
+    clock = time.perf_counter_ns
+
+    def on_decorator(func: Callable) -> Callable:
+        """
+        on_decorator is an original decorator.
+
+        Args:
+            func (Callable): original function.
+
+        Returns:
+            Callable: wrapper for function.
+        """
+        record = registry.register(f'{func.__module__}.{func.__qualname__}').record
+
+        def on_call(*args: tuple, **kwargs: dict) -> Any:
+            if not registry.enabled:
+                return func(*args, **kwargs)
+
+            start = clock()
+
+            try:
+                return func(*args, **kwargs)
+            finally:
+                record(clock() - start)
+
+        on_call.__name__ = func.__name__
+        on_call.__qualname__ = func.__qualname__
+        on_call.__wrapped__ = func
+        return on_call
+
+    def hooks(func: Callable) -> dict:
+        """
+        hooks is a function that implements hooks protocol of classtools.autod.fuse
+        in source form. Time is recorded in finally, so calls that raise are recorded
+        as by the wrapper.
+        """
+        record = registry.register(f'{func.__module__}.{func.__qualname__}').record
+        return {
+            'namespace': {'clock': clock, 'registry': registry, 'record': record},
+            'pre': ['{start} = {clock}() if {registry}.enabled else None'],
+            'final': ['if {start} is not None:', '    {record}({clock}() - {start})'],
+        }
+
+    on_decorator.hooks = hooks
+    return on_decorator
+
+
+def profile_all(registry: Registry = REGISTRY, lazy: bool = False, include: Union[Collection, Callable] = None,
+                exclude: Union[Collection, Callable] = None) -> Type:
+    """
+    profile_all is a function that returns metaclass that profiles all methods.
+
+    Args:
+        registry (Registry, optional): registry for statistics. Defaults to REGISTRY.
+        lazy (bool, optional): decorate method on its first lookup. Defaults to False.
+        include (Union[Collection, Callable], optional): names or predicate of methods to profile. Defaults to None.
+        exclude (Union[Collection, Callable], optional): names or predicate of methods to skip. Defaults to None.
+
+    Returns:
+        Type: metaclass
+    """
+    return decorate_all(profile(registry), lazy, include, exclude)
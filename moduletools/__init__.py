@@ -0,0 +1,17 @@
+#! /usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+moduletools: Instruments for listing, reloading and profiling modules.
+Submodules and names are imported on first access (PEP 562).
+"""
+
+
+from moduletools.lazy import lazymodule
+
+
+(__getattr__, __dir__, __all__) = lazymodule(__name__, ['importprof', 'lazy', 'mydir', 'reloader'], {
+    'ImportProfiler': 'importprof',
+    'listing': 'mydir',
+    'transitive_reload': 'reloader',
+    'snapshot': 'reloader',
+})
@@ -0,0 +1,439 @@
+#! /usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+importprof.py: Provides in-process import profiler, which hooks import system and
+records self and cumulative time (and memory, if traced) of every imported module
+as a tree. Modules with import-time side effects (opened files, environment changes,
+network, subprocesses, exceptions) are flagged.
+
+Usage:
+with ImportProfiler(memory=True) as profiler:
+    import nettools.nettools
+
+profiler.report(sortby='self')
+profiler.json(open('imports.json', 'w'))
+
+python -m moduletools.importprof nettools.nettools --sort self --json imports.json
+python -m moduletools.importprof timetools nettools.nettools --cold
+"""
+
+
+from importlib.machinery import all_suffixes
+from typing import Any, Type, Iterator
+import tracemalloc
+import subprocess
+import threading
+import argparse
+import time
+import json
+import sys
+
+
+EFFECTS = {
+    'open': 'file',
+    'os.putenv': 'environ',
+    'os.unsetenv': 'environ',
+    'socket.connect': 'network',
+    'socket.getaddrinfo': 'network',
+    'subprocess.Popen': 'subprocess',
+    'os.system': 'subprocess',
+    'os.exec': 'subprocess',
+    'webbrowser.open': 'browser',
+}
+SUFFIXES = tuple(all_suffixes()) + ('.pyc',)
+SAMPLES = 3
+SLOW = 0.05
+
+ACTIVE = []
+HOOKED = False
+
+
+def audit(event: str, args: tuple) -> None:
+    """
+    audit: Audit hook, which passes side effects to the innermost active profiler.
+    It's installed once for the process and checks only one list when no profiler is active.
+        1) event - name of audit event.
+        2) args - arguments of audit event.
+    """
+    if ACTIVE and event in EFFECTS:
+        ACTIVE[-1].effect(event, args)
+
+
+class ModuleRecord:
+    """
+    ModuleRecord is a node of import tree. Times are in nanoseconds, memory is in bytes.
+    Cumulative values include imports made while the module body was executed.
+    """
+    __slots__ = ('name', 'parent', 'children', 'cumulative', 'self', 'memory', 'selfmemory', 'effects', 'error')
+
+    def __init__(self: Type, name: str, parent: 'ModuleRecord' = None) -> None:
+        self.name = name
+        self.parent = parent
+        self.children = []
+        self.cumulative = 0
+        self.self = 0
+        self.memory = None
+        self.selfmemory = None
+        self.effects = {}
+        self.error = None
+
+    def flags(self: Type, slow: float = SLOW) -> list:
+        """
+        flags is a method that returns list of reasons why import of the module is heavy.
+        """
+        flags = sorted(self.effects)
+
+        if self.error is not None:
+            flags.append('raises')
+        if self.self > slow * 1e9:
+            flags.append('slow')
+
+        return flags
+
+    def asdict(self: Type, sortby: str = 'cumulative') -> dict:
+        """
+        asdict is a method that returns JSON-compatible view of the subtree.
+        """
+        return {
+            'name': self.name,
+            'self_ns': self.self,
+            'cumulative_ns': self.cumulative,
+            'self_memory': self.selfmemory,
+            'cumulative_memory': self.memory,
+            'flags': self.flags(),
+            'effects': self.effects,
+            'error': self.error,
+            'children': [child.asdict(sortby) for child in sortedrecords(self.children, sortby)],
+        }
+
+
+def sortedrecords(records: list, sortby: str) -> list:
+    """
+    sortedrecords: Returns records sorted in descending order.
+        1) records - ModuleRecord objects.
+        2) sortby - 'cumulative', 'self', 'memory', 'selfmemory' or 'name'.
+    """
+    if sortby == 'name':
+        return sorted(records, key=lambda record: record.name)
+
+    return sorted(records, key=lambda record: getattr(record, sortby) or 0, reverse=True)
+
+
+class ProfiledLoader:
+    """
+    ProfiledLoader is a proxy of original loader, which measures execution of module body.
+    Original loader is put back to the module after execution.
+    """
+    def __init__(self: Type, loader: Any, profiler: 'ImportProfiler') -> None:
+        self.loader = loader
+        self.profiler = profiler
+
+    def __getattr__(self: Type, attr: str) -> Any:
+        return getattr(self.loader, attr)
+
+    def create_module(self: Type, spec: Any) -> Any:
+        return self.loader.create_module(spec)
+
+    def exec_module(self: Type, module: Any) -> None:
+        module.__loader__ = self.loader
+
+        if module.__spec__ is not None:
+            module.__spec__.loader = self.loader
+
+        self.profiler.execute(self.loader, module)
+
+
+class ImportProfiler:
+    """
+    ImportProfiler is a meta path finder, which wraps loaders of all modules imported
+    while it is started. Only modules imported for the first time are recorded.
+    """
+    def __init__(self: Type, memory: bool = False, effects: bool = True, slow: float = SLOW) -> None:
+        """
+        Args:
+            memory (bool, optional): trace memory allocated by imports (slows them down). Defaults to False.
+            effects (bool, optional): record side effects via audit hook. Defaults to True.
+            slow (float, optional): self time in seconds to flag module as slow. Defaults to SLOW.
+        """
+        self.memory = memory
+        self.effects = effects
+        self.slow = slow
+        self.roots = []
+        self.records = {}
+        self.local = threading.local()
+        self.tracing = False
+
+    def start(self: Type) -> 'ImportProfiler':
+        """
+        start is a method that installs the profiler first in sys.meta_path.
+        """
+        global HOOKED
+
+        if self.effects and not HOOKED:
+            sys.addaudithook(audit)
+            HOOKED = True
+
+        if self.memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self.tracing = True
+
+        sys.meta_path.insert(0, self)
+        ACTIVE.append(self)
+        return self
+
+    def stop(self: Type) -> None:
+        """
+        stop is a method that removes the profiler from sys.meta_path.
+        """
+        if self in sys.meta_path:
+            sys.meta_path.remove(self)
+        if self in ACTIVE:
+            ACTIVE.remove(self)
+        if self.tracing:
+            tracemalloc.stop()
+            self.tracing = False
+
+    def __enter__(self: Type) -> 'ImportProfiler':
+        return self.start()
+
+    def __exit__(self: Type, *exc_info: tuple) -> None:
+        self.stop()
+
+    def find_spec(self: Type, name: str, path: Any = None, target: Any = None) -> Any:
+        """
+        find_spec is a method that finds spec by the rest of finders and wraps its loader.
+        """
+        for finder in sys.meta_path:
+            if finder is self or isinstance(finder, ImportProfiler):
+                continue
+
+            find = getattr(finder, 'find_spec', None)
+            spec = find(name, path, target) if find is not None else None
+
+            if spec is not None:
+                break
+        else:
+            return None
+
+        if spec.loader is not None and hasattr(spec.loader, 'exec_module'):
+            spec.loader = ProfiledLoader(spec.loader, self)
+
+        return spec
+
+    def stack(self: Type) -> list:
+        """
+        stack is a method that returns stack of modules executed in current thread.
+        """
+        if not hasattr(self.local, 'stack'):
+            self.local.stack = []
+        return self.local.stack
+
+    def execute(self: Type, loader: Any, module: Any) -> None:
+        """
+        execute is a method that executes module body and records it in the tree.
+        """
+        stack = self.stack()
+        record = ModuleRecord(module.__name__, stack[-1] if stack else None)
+        (record.parent.children if record.parent else self.roots).append(record)
+        self.records[record.name] = record
+
+        memory = tracemalloc.get_traced_memory()[0] if self.tracing else None
+        stack.append(record)
+        start = time.perf_counter_ns()
+
+        try:
+            loader.exec_module(module)
+        except BaseException as error:
+            record.error = f'{type(error).__name__}: {error}'
+            raise
+        finally:
+            record.cumulative = time.perf_counter_ns() - start
+            record.self = record.cumulative - sum(child.cumulative for child in record.children)
+            stack.pop()
+
+            if memory is not None:
+                record.memory = tracemalloc.get_traced_memory()[0] - memory
+                record.selfmemory = record.memory - sum(child.memory or 0 for child in record.children)
+
+    def effect(self: Type, event: str, args: tuple) -> None:
+        """
+        effect is a method that records side effect to the module being executed.
+        Files opened by import system itself (sources, bytecode, extensions) are ignored.
+        """
+        stack = self.stack()
+
+        if not stack:
+            return
+
+        if event == 'open':
+            if not isinstance(args[0], str) or args[0].endswith(SUFFIXES):
+                return
+
+        samples = stack[-1].effects.setdefault(EFFECTS[event], [])
+
+        if len(samples) < SAMPLES:
+            samples.append(f'{event}{args!r}'[:120])
+
+    def flagged(self: Type) -> list:
+        """
+        flagged is a method that returns records of modules with heavy import-time side effects.
+        """
+        return [record for record in self.records.values() if record.flags(self.slow)]
+
+    def lines(self: Type, sortby: str = 'cumulative', tree: bool = True, limit: int = None) -> Iterator:
+        """
+        lines is a method that yields lines of text report.
+            1) sortby - 'cumulative', 'self', 'memory', 'selfmemory' or 'name'.
+            2) tree - if True, children are printed under their parents, else as flat table.
+            3) limit - maximal number of lines of flat table.
+        """
+        yield f'{"self ms":>10}{"cumul ms":>10}{"self KiB":>10}{"cumul KiB":>10}  module'
+
+        def kib(size: int) -> str:
+            return f'{size / 1024:>10.1f}' if size is not None else f'{"-":>10}'
+
+        def line(record: ModuleRecord, level: int) -> str:
+            flags = record.flags(self.slow)
+            return (
+                f'{record.self / 1e6:>10.2f}{record.cumulative / 1e6:>10.2f}'
+                f'{kib(record.selfmemory)}{kib(record.memory)}  {"  " * level}{record.name}'
+                + (f'  [{", ".join(flags)}]' if flags else '')
+            )
+
+        if not tree:
+            for record in sortedrecords(self.records.values(), sortby)[:limit]:
+                yield line(record, 0)
+            return
+
+        pending = [(record, 0) for record in reversed(sortedrecords(self.roots, sortby))]
+
+        while pending:
+            (record, level) = pending.pop()
+            yield line(record, level)
+            pending.extend((child, level + 1) for child in reversed(sortedrecords(record.children, sortby)))
+
+    def report(self: Type, file: Any = None, sortby: str = 'cumulative', tree: bool = True, limit: int = None) -> None:
+        """
+        report is a method that prints text report (see lines) to file (sys.stdout by default).
+        """
+        for line in self.lines(sortby, tree, limit):
+            print(line, file=file if file is not None else sys.stdout)
+
+    def asdict(self: Type, sortby: str = 'cumulative') -> dict:
+        """
+        asdict is a method that returns JSON-compatible view of import tree.
+        """
+        return {
+            'roots': [record.asdict(sortby) for record in sortedrecords(self.roots, sortby)],
+            'flagged': sorted(record.name for record in self.flagged()),
+        }
+
+    def json(self: Type, file: Any = None, sortby: str = 'cumulative') -> None:
+        """
+        json is a method that writes import tree in JSON format to file (sys.stdout by default).
+        """
+        json.dump(self.asdict(sortby), file if file is not None else sys.stdout, indent=2)
+
+
+COLDSTART = """
+import time
+start = time.perf_counter_ns()
+{statement}
+elapsed = time.perf_counter_ns() - start
+try:
+    import resource
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+except ImportError:
+    maxrss = None
+print(elapsed, maxrss)
+"""
+
+
+def coldstart(statement: str, repeat: int = 5) -> dict:
+    """
+    coldstart: Runs statement in fresh interpreters and returns best import time and
+    peak RSS of the process (ru_maxrss, KiB on Linux, None where it's unavailable).
+        1) statement - statement to be measured, e.g. 'import timetools.timerd'.
+        2) repeat - number of interpreters, the best one is taken.
+    """
+    times = []
+    sizes = []
+
+    for _ in range(repeat):
+        output = subprocess.run(
+            [sys.executable, '-c', COLDSTART.format(statement=statement)],
+            capture_output=True, text=True, check=True,
+        ).stdout.split()
+        times.append(int(output[0]))
+        sizes.append(None if output[1] == 'None' else int(output[1]))
+
+    return {
+        'statement': statement,
+        'import_ns': min(times),
+        'maxrss_kib': min(sizes) if None not in sizes else None,
+    }
+
+
+def coldreport(modules: list, repeat: int = 5, file: Any = None) -> list:
+    """
+    coldreport: Prints cold-start cost of importing every module over bare interpreter.
+        1) modules - names of modules.
+        2) repeat - number of interpreters for every module.
+        3) file - stream to print to (sys.stdout by default).
+    Returns list of coldstart results, the first one is bare interpreter.
+    """
+    file = file if file is not None else sys.stdout
+    results = [coldstart('pass', repeat)] + [coldstart(f'import {name}', repeat) for name in modules]
+    base = results[0]['maxrss_kib']
+    print(f'{"import ms":>10}{"RSS KiB":>10}{"+RSS KiB":>10}  statement', file=file)
+
+    for result in results:
+        rss = result['maxrss_kib']
+        print(
+            f'{result["import_ns"] / 1e6:>10.2f}{rss if rss is not None else "-":>10}'
+            f'{rss - base if rss is not None and base is not None else "-":>10}  {result["statement"]}',
+            file=file,
+        )
+
+    return results
+
+
+def main(argv: list = None) -> None:
+    """
+    main: Command line interface, which profiles import of modules.
+    """
+    parser = argparse.ArgumentParser(description='Import-time profile of modules.')
+    parser.add_argument('modules', nargs='+', help='names of modules to import')
+    parser.add_argument('--sort', default='cumulative', choices=('cumulative', 'self', 'memory', 'selfmemory', 'name'))
+    parser.add_argument('--flat', action='store_true', help='print flat table instead of tree')
+    parser.add_argument('--limit', type=int, help='number of lines of flat table')
+    parser.add_argument('--memory', action='store_true', help='trace memory allocated by imports')
+    parser.add_argument('--json', help='save import tree to this file')
+    parser.add_argument('--cold', action='store_true', help='measure imports in fresh interpreters instead')
+    parser.add_argument('--repeat', type=int, default=5, help='fresh interpreters for --cold')
+    args = parser.parse_args(argv)
+
+    if args.cold:
+        results = coldreport(args.modules, args.repeat)
+
+        if args.json:
+            with open(args.json, 'w', encoding='UTF-8') as file:
+                json.dump(results, file, indent=2)
+        return
+
+    with ImportProfiler(memory=args.memory) as profiler:
+        for name in args.modules:
+            try:
+                __import__(name)
+            except Exception as error:
+                print(f'import of {name} failed: {type(error).__name__}: {error}', file=sys.stderr)
+
+    profiler.report(sortby=args.sort, tree=not args.flat, limit=args.limit)
+
+    if args.json:
+        with open(args.json, 'w', encoding='UTF-8') as file:
+            profiler.json(file, args.sort)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+#! /usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+lazy.py: Provides PEP 562 module __getattr__ and __dir__, which import submodules
+of a package and names exported from them on first access. Importing package
+itself costs almost nothing, so this module imports only sys (not even typing).
+
+Usage (in package/__init__.py):
+(__getattr__, __dir__, __all__) = lazymodule(__name__, ['helpers'], {'helper': 'helpers'})
+"""
+
+
+import sys
+
+
+def submodule(name: str) -> object:
+    """
+    submodule: Imports module by its full name and returns it.
+        1) name - full name of module.
+    """
+    __import__(name)
+    return sys.modules[name]
+
+
+def lazymodule(package: str, submodules: list = (), exports: dict = None) -> tuple:
+    """
+    lazymodule: Returns (__getattr__, __dir__, __all__) for package.
+        1) package - name of package.
+        2) submodules - names of submodules, which are imported on first access.
+        3) exports - {name: submodule} of names, which are imported from submodules on first access.
+    Resolved name is set to package, so __getattr__ is called only once for every name.
+    """
+    submodules = frozenset(submodules)
+    exports = dict(exports or {})
+    names = sorted(submodules | exports.keys())
+
+    def __getattr__(name: str) -> object:
+        if name in exports:
+            value = getattr(submodule(f'{package}.{exports[name]}'), name)
+        elif name in submodules:
+            value = submodule(f'{package}.{name}')
+        else:
+            raise AttributeError(f'module {package!r} has no attribute {name!r}')
+
+        setattr(sys.modules[package], name, value)
+        return value
+
+    def __dir__() -> list:
+        return sorted(set(vars(sys.modules[package])) | set(names))
+
+    return (__getattr__, __dir__, names)
+
+
+def lazyattrs(resolve: object, names: tuple, module: str) -> object:
+    """
+    lazyattrs: Returns module __getattr__, which gets names from mapping returned by resolve().
+    resolve should read the mapping once and return the same mapping later.
+        1) resolve - function without arguments returning {name: value}, e.g. reading of configuration.
+        2) names - names of module globals provided by resolve.
+        3) module - name of module for error message.
+    """
+    names = frozenset(names)
+
+    def __getattr__(name: str) -> object:
+        if name not in names:
+            raise AttributeError(f'module {module!r} has no attribute {name!r}')
+
+        return resolve()[name]
+
+    return __getattr__
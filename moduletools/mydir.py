@@ -2,14 +2,25 @@
 # -*- coding: utf-8 -*-
 """
 mydir: Module, which prints names defined in other module.
+It also measures deep memory size of every name of the module (or of all modules)
+without printing, see namesizes.
+
+Usage:
+records = namesizes(budget=2.0)
+for record in sorted(records, key=lambda record: record['deep'], reverse=True)[:10]:
+    print(record)
 """
 
 
 from types import ModuleType
+import time
+import sys
+import gc
 
 
 SEPLEN = 60
 SEPCHR = '-'
+CHECKEVERY = 1024
 
 
 def listing(module: ModuleType, verbose: bool = True) -> None:
@@ -33,3 +44,82 @@ def listing(module: ModuleType, verbose: bool = True) -> None:
         print(sepline)
         print(module.__name__, f'has {count + 1} names')
         print(sepline)
+
+
+def deepsize(obj: object, seen: set, skip: set, deadline: float = None) -> tuple:
+    """
+    deepsize: Returns (size in bytes, number of objects, complete) of obj and objects reachable
+    from it, which have not been seen yet. Traversal is iterative and cycle-safe, modules,
+    classes and namespaces of modules are not entered (they are measured by their names).
+        1) obj - any object.
+        2) seen - ids of objects which have been measured, visited objects are added.
+        3) skip - ids of objects which should not be entered.
+        4) deadline - time.perf_counter() value, after which traversal is stopped (complete is False).
+    """
+    size = count = 0
+    pending = [obj]
+
+    while pending:
+        current = pending.pop()
+
+        if id(current) in seen:
+            continue
+
+        seen.add(id(current))
+        size += sys.getsizeof(current, 0)
+        count += 1
+
+        if deadline is not None and not count % CHECKEVERY and time.perf_counter() > deadline:
+            return (size, count, False)
+
+        for ref in gc.get_referents(current):
+            if id(ref) not in seen and id(ref) not in skip and not isinstance(ref, (ModuleType, type)):
+                pending.append(ref)
+
+    return (size, count, True)
+
+
+def namesizes(module: ModuleType = None, budget: float = None, dunders: bool = False) -> list:
+    """
+    namesizes: Returns records with sizes of all names of the module without printing.
+    Objects shared by several names (or modules) are counted once, for the first name.
+    Record is {'module', 'name', 'type', 'size' (shallow), 'deep', 'objects', 'complete'},
+    so records can be sorted by any key. 'deep' is always int: modules (measured on their own)
+    have 0, names left when budget is over have 0 and 'complete' False.
+        1) module - module, whose names will be measured, None means all sys.modules.
+        2) budget - time budget in seconds or None.
+        3) dunders - if True, names like __builtins__ are measured too.
+    """
+    modules = [module] if module is not None else list(sys.modules.values())
+    skip = {id(vars(mod)) for mod in list(sys.modules.values()) if isinstance(mod, ModuleType)}
+    skip.update(id(mod) for mod in modules)
+    deadline = time.perf_counter() + budget if budget is not None else None
+    seen = set()
+    records = []
+
+    for mod in modules:
+        if not isinstance(mod, ModuleType):
+            continue
+
+        for (name, value) in list(vars(mod).items()):
+            if not dunders and name.startswith('__'):
+                continue
+
+            record = {
+                'module': mod.__name__,
+                'name': name,
+                'type': type(value).__qualname__,
+                'size': sys.getsizeof(value, 0),
+                'deep': 0,
+                'objects': 0,
+                'complete': False,
+            }
+
+            if isinstance(value, ModuleType) or (deadline is not None and time.perf_counter() > deadline):
+                record['complete'] = isinstance(value, ModuleType)
+            else:
+                (record['deep'], record['objects'], record['complete']) = deepsize(value, seen, skip, deadline)
+
+            records.append(record)
+
+    return records
@@ -2,35 +2,286 @@
 # -*- coding: utf-8 -*-
 """
 reloader.py: Provides functions to transitive reload of modules.
+Only modules whose source has changed and modules which depend on them are
+reloaded, dependencies are reloaded before their dependents. Bytecode of these
+modules can be compiled in a process pool before reloading.
+Sources are compared with signatures recorded by snapshot or by previous reload,
+sources without them are considered changed if they were modified after this module
+was imported (call snapshot once application is imported for exact baseline).
 """
 
 
+from importlib.util import cache_from_source
+from concurrent.futures import ProcessPoolExecutor
+from py_compile import PycInvalidationMode
 from importlib import reload
 from types import ModuleType
 from typing import Any
+import py_compile
+import hashlib
+import time
+import sys
+import os
 
 
-def transitive_reload(objs: Any, visited: dict, verbose: bool = True) -> None:
+SIGNATURES = {}
+IMPORTED = time.time_ns()
+
+
+def sourcefile(module: ModuleType) -> str:
+    """
+    sourcefile: Returns path to .py source of the module or None (builtin, extension, frozen).
+        1) module - any module.
+    """
+    spec = getattr(module, '__spec__', None)
+    filename = getattr(module, '__file__', None)
+
+    if spec is not None and spec.origin == 'frozen':
+        return None
+
+    return filename if filename and filename.endswith('.py') and os.path.exists(filename) else None
+
+
+def signature(filename: str) -> tuple:
+    """
+    signature: Returns (mtime in ns, size, sha1 of content) of the file.
+        1) filename - path to file.
+    """
+    stat = os.stat(filename)
+
+    with open(filename, 'rb') as file:
+        digest = hashlib.sha1(file.read()).hexdigest()
+
+    return (stat.st_mtime_ns, stat.st_size, digest)
+
+
+def snapshot(modules: Any = None) -> int:
+    """
+    snapshot: Records signatures of sources of modules as baseline of change detection.
+    Should be called when modules are loaded (e.g. after imports of application),
+    because only the process knows which source it has loaded, cached bytecode is
+    shared by all processes and can be refreshed without reloading the module.
+    Returns number of recorded modules.
+        1) modules - modules to be recorded, None means all sys.modules.
+    """
+    modules = list(sys.modules.values()) if modules is None else modules
+    recorded = 0
+
+    for module in modules:
+        filename = sourcefile(module) if isinstance(module, ModuleType) else None
+
+        if filename is not None:
+            SIGNATURES[module.__name__] = signature(filename)
+            recorded += 1
+
+    return recorded
+
+
+def changed(module: ModuleType) -> str:
+    """
+    changed: Returns reason why the module should not be reloaded or None if it changed.
+    Recorded signature is compared by mtime and size first and by content hash only
+    when they differ. Module which has not been recorded (by snapshot or by reload)
+    is considered changed if its source was modified after this module was imported,
+    otherwise its signature is recorded as baseline. Cached bytecode is not used,
+    since it's shared by all processes and says nothing about loaded source.
+        1) module - any module.
+    """
+    filename = sourcefile(module)
+
+    if filename is None:
+        return 'no source'
+
+    recorded = SIGNATURES.get(module.__name__)
+    stat = os.stat(filename)
+
+    if recorded is None:
+        if stat.st_mtime_ns > IMPORTED:
+            return None
+
+        SIGNATURES[module.__name__] = signature(filename)
+        return 'no baseline (recorded)'
+
+    if recorded[:2] == (stat.st_mtime_ns, stat.st_size):
+        return 'unchanged'
+
+    current = signature(filename)
+    SIGNATURES[module.__name__] = current
+    return 'unchanged (same hash)' if current[2] == recorded[2] else None
+
+
+def dependencies(module: ModuleType) -> set:
+    """
+    dependencies: Returns modules which module refers to: modules in its namespace
+    and modules of functions and classes imported into it.
+        1) module - any module.
+    """
+    found = set()
+
+    for value in list(vars(module).values()):
+        if isinstance(value, ModuleType):
+            found.add(value)
+        else:
+            try:
+                source = sys.modules.get(value.__module__) if isinstance(value.__module__, str) else None
+            except Exception:
+                continue
+
+            if source is not None:
+                found.add(source)
+
+    found.discard(module)
+    return found
+
+
+def modulegraph(objs: Any) -> dict:
     """
-    transitive_reload: Reload modules and all their submodules.
+    modulegraph: Returns dependency graph {module: set of modules it depends on}
+    of all modules reachable from objs.
+        1) objs - objects where there are modules.
+    """
+    graph = {}
+    pending = [obj for obj in objs if isinstance(obj, ModuleType)]
+
+    while pending:
+        module = pending.pop()
+
+        if module not in graph:
+            graph[module] = dependencies(module)
+            pending.extend(graph[module] - graph.keys())
+
+    return graph
+
+
+def compilefile(filename: str, invalidation: PycInvalidationMode) -> str:
+    """
+    compilefile: Compiles source to its cached bytecode like py_compile does.
+    Returns error message or None. Runs in worker processes of precompile.
+        1) filename - path to source.
+        2) invalidation - py_compile invalidation mode of .pyc.
+    """
+    try:
+        py_compile.compile(filename, cache_from_source(filename), doraise=True, invalidation_mode=invalidation)
+    except (py_compile.PyCompileError, OSError) as error:
+        return str(error).strip()
+    return None
+
+
+def precompile(filenames: list, workers: int = None,
+               invalidation: PycInvalidationMode = PycInvalidationMode.TIMESTAMP) -> dict:
+    """
+    precompile: Compiles bytecode of many sources in a process pool.
+    Returns {filename: error message} for sources which failed to compile.
+        1) filenames - paths to sources.
+        2) workers - number of processes (os.cpu_count() by default).
+        3) invalidation - py_compile invalidation mode of .pyc.
+    """
+    if not filenames:
+        return {}
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        errors = pool.map(compilefile, filenames, [invalidation] * len(filenames))
+        return {filename: error for (filename, error) in zip(filenames, errors) if error}
+
+
+def reloadplan(objs: Any, visited: set) -> tuple:
+    """
+    reloadplan: Returns (order, reasons), where order is list of modules to be reloaded
+    (changed modules and modules which depend on them, dependencies first) and reasons
+    is {module: reason} for skipped modules.
         1) objs - names of modules where there are modules to be reload too.
-        2) visited - storage of visited modules to restrict cycles.
+        2) visited - modules which should not be reloaded again.
+    """
+    graph = modulegraph(objs)
+    dependents = {module: set() for module in graph}
+    reasons = {}
+
+    for (module, deps) in graph.items():
+        for dep in deps:
+            dependents[dep].add(module)
+
+    for module in graph:
+        if module not in visited:
+            reasons[module] = changed(module)
+
+    pending = [module for (module, reason) in reasons.items() if reason is None]
+
+    while pending:
+        for dependent in dependents[pending.pop()]:
+            if dependent not in visited and sourcefile(dependent) and reasons.get(dependent) is not None:
+                reasons[dependent] = None
+                pending.append(dependent)
+
+    order = []
+    placed = set()
+
+    for root in graph:
+        stack = [(root, False)]
+
+        while stack:
+            (module, expanded) = stack.pop()
+
+            if expanded:
+                if reasons.get(module, '') is None:
+                    order.append(module)
+                continue
+
+            if module in placed:
+                continue
+
+            placed.add(module)
+            stack.append((module, True))
+            stack.extend((dep, False) for dep in graph[module] if dep not in placed)
+
+    skipped = {module: reason for (module, reason) in reasons.items() if reason is not None}
+    return (order, skipped)
+
+
+def transitive_reload(objs: Any, visited: set, verbose: bool = True, workers: int = 0,
+                      invalidation: PycInvalidationMode = PycInvalidationMode.TIMESTAMP) -> dict:
+    """
+    transitive_reload: Reload changed modules and all modules which depend on them.
+        1) objs - names of modules where there are modules to be reload too.
+        2) visited - storage of visited modules to restrict cycles, reloaded modules are added.
         3) verbose - if True, additional information will be printed.
+        4) workers - if not 0, bytecode of modules is compiled in a pool of workers processes
+           (None means os.cpu_count()) before reloading, so reload only executes module bodies.
+        5) invalidation - py_compile invalidation mode of precompiled .pyc.
+    Returns report {'reloaded': [module names in order], 'skipped': {module name: reason}}.
     """
-    for obj in objs:
-        if isinstance(obj, ModuleType) and obj not in visited:
-            visited.add(obj)
+    (order, skipped) = reloadplan(objs, visited)
+    report = {'reloaded': [], 'skipped': {module.__name__: reason for (module, reason) in skipped.items()}}
+
+    if workers != 0:
+        errors = precompile([sourcefile(module) for module in order], workers, invalidation)
+
+        for module in [module for module in order if sourcefile(module) in errors]:
+            order.remove(module)
+            report['skipped'][module.__name__] = f'compile error: {errors[sourcefile(module)]}'
+
+    for module in order:
+        visited.add(module)
+
+        if verbose:
+            print(f'reloading {module.__name__}')
+
+        reload(module)
+        SIGNATURES[module.__name__] = signature(sourcefile(module))
+        report['reloaded'].append(module.__name__)
 
-            if verbose:
-                print(f'reloading {obj.__name__}')
+    if verbose:
+        for (name, reason) in report['skipped'].items():
+            print(f'skipping {name}: {reason}')
 
-            reload(obj)
-            transitive_reload(obj.__dict__.values(), visited)
+    return report
 
 
-def reloader(*modules: tuple) -> None:
+def reloader(*modules: tuple, verbose: bool = True, workers: int = 0) -> dict:
     """
     reloader: Wrapper for transitive_reload function.
         1) modules - tuple of modules to be reload.
+        2) verbose - if True, additional information will be printed.
+        3) workers - if not 0, precompile bytecode in a process pool first (None for os.cpu_count()).
+    Returns report of transitive_reload.
     """
-    transitive_reload(modules, set())
+    return transitive_reload(modules, set(), verbose, workers)
@@ -0,0 +1,18 @@
+#! /usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+nettools: Mail, FTP and HTTP clients and servers.
+Submodules and names are imported on first access (PEP 562),
+configuration of clients is read on first use.
+"""
+
+
+from moduletools.lazy import lazymodule
+
+
+(__getattr__, __dir__, __all__) = lazymodule(__name__, ['httpclient', 'httpserver', 'nettools'], {
+    'pop3': 'nettools',
+    'imap': 'nettools',
+    'smtp': 'nettools',
+    'ftp': 'nettools',
+})
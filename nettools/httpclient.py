@@ -2,20 +2,291 @@
 # -*- coding: utf-8 -*-
 """
 httpclient.py: Simple http client just practice http.client module.
+Client keeps a pool of keep-alive connections for every host, so requests to
+the same host don't pay TCP (and TLS) handshake again. Batches of requests are
+sent by a bounded number of threads, response bodies can be streamed to files.
+
+Usage:
+with Client() as client:
+    print(client.request('GET', 'http://localhost:8000/').body)
+    client.stream('GET', 'http://localhost:8000/big.bin', 'big.bin')
+    responses = client.fetchall(['http://localhost:8000/a', 'http://localhost:8000/b'], concurrency=8)
+
+python -m nettools.httpclient http://localhost:8000/ --data 'Hello from Client!'
 """
 
 
-from http.client import HTTPConnection
+from http.client import HTTPConnection, HTTPSConnection, HTTPMessage
+from concurrent.futures import ThreadPoolExecutor
+from typing import Type, Any, Iterable, Union
+from urllib.parse import urlsplit
+import threading
+import argparse
+import posixpath
+import os
+
+
+HOST = 'localhost'
+PORT = 8000
+MAXSIZE = 8
+TIMEOUT = 10
+CHUNK = 65536
+IDEMPOTENT = frozenset(('GET', 'HEAD', 'PUT', 'DELETE', 'OPTIONS', 'TRACE'))
+
+
+class Response:
+    """
+    Response is a class that keeps status, headers and body of response.
+    """
+    __slots__ = ('status', 'reason', 'headers', 'body')
+
+    def __init__(self: Type, status: int, reason: str, headers: HTTPMessage, body: bytes) -> None:
+        self.status = status
+        self.reason = reason
+        self.headers = headers
+        self.body = body
+
+    def __repr__(self: Type) -> str:
+        return f'<Response {self.status} {self.reason} ({len(self.body)} bytes)>'
+
+
+class HostPool:
+    """
+    HostPool is a class that keeps idle keep-alive connections of one host and
+    limits number of connections to the host which are used at the same time.
+    """
+    def __init__(self: Type, scheme: str, netloc: str, maxsize: int = MAXSIZE, timeout: float = TIMEOUT) -> None:
+        """
+        Args:
+            scheme (str): 'http' or 'https'.
+            netloc (str): host and optional port.
+            maxsize (int, optional): maximal number of connections to the host. Defaults to MAXSIZE.
+            timeout (float, optional): timeout of socket operations in seconds. Defaults to TIMEOUT.
+        """
+        self.connection = HTTPSConnection if scheme == 'https' else HTTPConnection
+        self.netloc = netloc
+        self.timeout = timeout
+        self.idle = []
+        self.lock = threading.Lock()
+        self.slots = threading.BoundedSemaphore(maxsize)
+
+    def acquire(self: Type) -> tuple:
+        """
+        acquire is a method that returns (connection, reused), it waits while all
+        connections to the host are used.
+        """
+        self.slots.acquire()
+
+        with self.lock:
+            if self.idle:
+                return (self.idle.pop(), True)
+
+        try:
+            return (self.connection(self.netloc, timeout=self.timeout), False)
+        except BaseException:
+            self.slots.release()
+            raise
+
+    def release(self: Type, connection: HTTPConnection, reusable: bool) -> None:
+        """
+        release is a method that returns connection to the pool or closes it.
+        """
+        if reusable:
+            with self.lock:
+                self.idle.append(connection)
+        else:
+            connection.close()
+
+        self.slots.release()
+
+    def close(self: Type) -> None:
+        """
+        close is a method that closes all idle connections.
+        """
+        with self.lock:
+            (idle, self.idle) = (self.idle, [])
+
+        for connection in idle:
+            connection.close()
+
+
+class Client:
+    """
+    Client is a class that sends requests through pools of keep-alive connections.
+    It's thread-safe, one client should be shared by all threads.
+    """
+    def __init__(self: Type, maxsize: int = MAXSIZE, timeout: float = TIMEOUT) -> None:
+        """
+        Args:
+            maxsize (int, optional): maximal number of connections to one host. Defaults to MAXSIZE.
+            timeout (float, optional): timeout of socket operations in seconds. Defaults to TIMEOUT.
+        """
+        self.maxsize = maxsize
+        self.timeout = timeout
+        self.pools = {}
+        self.lock = threading.Lock()
+
+    def __enter__(self: Type) -> 'Client':
+        return self
+
+    def __exit__(self: Type, *exc_info: tuple) -> None:
+        self.close()
+
+    def pool(self: Type, scheme: str, netloc: str) -> HostPool:
+        """
+        pool is a method that returns HostPool of host, creating it if needed.
+        """
+        key = (scheme, netloc)
+
+        with self.lock:
+            if key not in self.pools:
+                self.pools[key] = HostPool(scheme, netloc, self.maxsize, self.timeout)
+            return self.pools[key]
+
+    def open(self: Type, method: str, url: str, body: bytes = None, headers: dict = None) -> tuple:
+        """
+        open is a method that sends request and returns (pool, connection, response)
+        with not read body. Idempotent request which fails on reused connection (closed
+        by server while it was idle) is sent again on a new connection, other requests
+        could have been processed by server already, so they aren't repeated.
+        """
+        parts = urlsplit(url)
+        pool = self.pool(parts.scheme or 'http', parts.netloc)
+        target = (parts.path or '/') + (f'?{parts.query}' if parts.query else '')
+        retry = method.upper() in IDEMPOTENT
+
+        while True:
+            (connection, reused) = pool.acquire()
+
+            try:
+                connection.request(method, target, body, headers or {})
+                return (pool, connection, connection.getresponse())
+            except ConnectionError:
+                pool.release(connection, False)
+
+                if not (reused and retry):
+                    raise
+            except BaseException:
+                pool.release(connection, False)
+                raise
+
+    def request(self: Type, method: str, url: str, body: bytes = None, headers: dict = None) -> Response:
+        """
+        request is a method that sends request and returns Response with whole body.
+
+        Args:
+            method (str): HTTP method.
+            url (str): full URL, e.g. 'http://localhost:8000/path?query'.
+            body (bytes, optional): body of request, Content-Length is set for it. Defaults to None.
+            headers (dict, optional): headers of request. Defaults to None.
+
+        Returns:
+            Response: status, headers and body.
+        """
+        (pool, connection, response) = self.open(method, url, body, headers)
+
+        try:
+            data = response.read()
+        except BaseException:
+            pool.release(connection, False)
+            raise
+
+        pool.release(connection, not response.will_close)
+        return Response(response.status, response.reason, response.headers, data)
+
+    def stream(self: Type, method: str, url: str, file: Union[str, Any], body: bytes = None,
+               headers: dict = None, chunk: int = CHUNK) -> Response:
+        """
+        stream is a method that sends request and writes response body to file by chunks,
+        so the body is never kept in memory as a whole.
+
+        Args:
+            file (Union[str, Any]): path or binary stream to write to.
+            chunk (int, optional): size of chunk in bytes. Defaults to CHUNK.
+
+        Returns:
+            Response: status and headers, body is empty.
+        """
+        buffer = memoryview(bytearray(chunk))
+        output = open(file, 'wb') if isinstance(file, str) else file
+
+        try:
+            (pool, connection, response) = self.open(method, url, body, headers)
+
+            try:
+                while count := response.readinto(buffer):
+                    output.write(buffer[:count])
+            except BaseException:
+                pool.release(connection, False)
+                raise
+        finally:
+            if output is not file:
+                output.close()
+
+        pool.release(connection, not response.will_close)
+        return Response(response.status, response.reason, response.headers, b'')
+
+    def fetchall(self: Type, requests: Iterable, concurrency: int = MAXSIZE) -> list:
+        """
+        fetchall is a method that sends requests by concurrency threads.
+
+        Args:
+            requests (Iterable): URLs or tuples of arguments of request method.
+            concurrency (int, optional): number of threads. Defaults to MAXSIZE.
+
+        Returns:
+            list: Response or exception for every request in the same order.
+        """
+        def send(request: Union[str, tuple]) -> Any:
+            try:
+                return self.request('GET', request) if isinstance(request, str) else self.request(*request)
+            except Exception as error:
+                return error
+
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            return list(pool.map(send, requests))
+
+    def close(self: Type) -> None:
+        """
+        close is a method that closes idle connections of all hosts.
+        """
+        with self.lock:
+            pools = list(self.pools.values())
+
+        for pool in pools:
+            pool.close()
+
+
+def main(argv: list = None) -> None:
+    """
+    main: Command line interface of the client.
+    """
+    parser = argparse.ArgumentParser(description='Simple HTTP client with keep-alive connections.')
+    parser.add_argument('urls', nargs='*', default=[f'http://{HOST}:{PORT}/'])
+    parser.add_argument('--data', help='send POST requests with this body')
+    parser.add_argument('--output', help='stream bodies to files in this directory')
+    parser.add_argument('--concurrency', type=int, default=MAXSIZE, help='threads for requests')
+    args = parser.parse_args(argv)
+
+    with Client(maxsize=args.concurrency) as client:
+        if args.output:
+            def download(url: str) -> Response:
+                name = posixpath.basename(urlsplit(url).path) or 'index.html'
+                return client.stream('GET', url, os.path.join(args.output, name))
+
+            with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+                for (url, response) in zip(args.urls, pool.map(download, args.urls)):
+                    print(url, response.status, response.reason)
+            return
 
+        if args.data is not None:
+            requests = [('POST', url, args.data.encode()) for url in args.urls]
+        else:
+            requests = args.urls
 
-connection = HTTPConnection('localhost', 8000)
+        for response in client.fetchall(requests, args.concurrency):
+            print(response.body.decode() if isinstance(response, Response) else f'Error: {response!r}')
 
-connection.request('GET', 'localhost:8000/')
-response = connection.getresponse()
-message = response.read()
-print(message.decode())
 
-connection.request('POST', 'localhost:8000/', b'Hello from Client!', {'Content-Lenght': '18'})
-response = connection.getresponse()
-message = response.read()
-print(message.decode())
+if __name__ == '__main__':
+    main()
@@ -2,32 +2,530 @@
 # -*- coding: utf-8 -*-
 """
 httpserver.py: Simple http server just practice http.server module.
+RequestHandler speaks HTTP/1.1 with keep-alive and can be served by several engines:
+'single' (one thread), 'thread' (pool of threads) and 'asyncio' (event loop).
+'single' closes every connection after response, the others keep connections alive.
+Every engine can be pre-forked to several processes, which share the port via
+SO_REUSEPORT (or inherit one listening socket where it isn't available).
+Nothing is served when the module is imported.
+StaticHandler serves files of a directory by sendfile (bodies don't pass through
+Python), supports Range requests and answers conditional requests with 304 using
+metadata cached by stat of the file.
+
+Usage:
+serve('thread', workers=32, backlog=1024)
+serve('asyncio', processes=4)
+serve('thread', handler=static('public'))
+
+python -m nettools.httpserver --engine asyncio --processes 4 --backlog 1024
+python -m nettools.httpserver --static public
 """
 
 
 from http.server import HTTPServer, BaseHTTPRequestHandler
+from concurrent.futures import ThreadPoolExecutor
+from typing import Type, Any
+from email.utils import formatdate, parsedate_to_datetime
+from urllib.parse import unquote, urlsplit
+from stat import S_ISREG, S_ISDIR
+from io import BytesIO
+import mimetypes
+import posixpath
+import argparse
+import threading
+import asyncio
+import signal
+import socket
+import os
 
 
 PORT = 8000
 IPV4 = 'localhost'
 ADDRESS = (IPV4, PORT)
+BACKLOG = 128
+KEEPALIVE = 15
+MAXHEAD = 65536
+METASIZE = 4096
+METADATA = {}
 
 
 class RequestHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    timeout = KEEPALIVE
+
     def do_GET(self):
+        body = b'Hello from Server!'
         self.send_response(200)
-        self.send_header('Content-type', 'plain/text')
+        self.send_header('Content-type', 'text/plain')
+        self.send_header('Content-Length', str(len(body)))
         self.end_headers()
-        self.wfile.write(b'Hello from Server!')
+        self.wfile.write(body)
 
     def do_POST(self):
-        data = self.rfile.read(int(self.headers['Content-Length']))
+        data = self.rfile.read(int(self.headers.get('Content-Length', 0)))
         print(data.decode())
+        body = b'{"status": "OK"}'
         self.send_response(200)
         self.send_header('Content-type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def sendfile(self, file, offset, count):
+        self.wfile.flush()
+        self.connection.sendfile(file, offset, count)
+
+
+def metadata(path: str) -> tuple:
+    """
+    metadata: Returns (etag, last modified, content type, size, mtime) of regular file.
+    Metadata is cached while (inode, size, mtime) of the file is the same, so only
+    os.stat is called for files which have been served already.
+    Raises IsADirectoryError for directories and FileNotFoundError for other non-regular files.
+        1) path - path to file.
+    """
+    stat = os.stat(path)
+
+    if not S_ISREG(stat.st_mode):
+        raise IsADirectoryError(path) if S_ISDIR(stat.st_mode) else FileNotFoundError(path)
+    key = (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+    cached = METADATA.get(path)
+
+    if cached is not None and cached[0] == key:
+        return cached[1]
+
+    if len(METADATA) >= METASIZE:
+        METADATA.clear()
+
+    meta = (
+        f'"{stat.st_ino:x}-{stat.st_size:x}-{stat.st_mtime_ns:x}"',
+        formatdate(stat.st_mtime, usegmt=True),
+        mimetypes.guess_type(path)[0] or 'application/octet-stream',
+        stat.st_size,
+        int(stat.st_mtime),
+    )
+    METADATA[path] = (key, meta)
+    return meta
+
+
+def byterange(header: str, size: int) -> Any:
+    """
+    byterange: Returns (first, last) bytes of single range of Range header, None if the
+    header should be ignored (not bytes, invalid, reversed or several ranges), False if
+    the range can't be satisfied.
+        1) header - value of Range header.
+        2) size - size of file.
+    """
+    (unit, _, spec) = header.partition('=')
+
+    if unit.strip().lower() != 'bytes' or ',' in spec:
+        return None
+
+    (first, _, last) = spec.strip().partition('-')
+
+    if not (first or last) or not (first or '0').isdigit() or not (last or '0').isdigit():
+        return None
+
+    if not first:
+        return (max(size - int(last), 0), size - 1) if int(last) and size else False
+
+    if last and int(last) < int(first):
+        return None
+
+    if int(first) >= size:
+        return False
+
+    return (int(first), min(int(last), size - 1) if last else size - 1)
+
+
+class StaticHandler(RequestHandler):
+    """
+    StaticHandler serves files from directory, use static to set directory.
+    """
+    directory = os.getcwd()
+
+    def do_GET(self):
+        self.serve_file(head=False)
+
+    def do_HEAD(self):
+        self.serve_file(head=True)
+
+    def translate_path(self, path):
+        url = unquote(urlsplit(path).path)
+        parts = [part for part in posixpath.normpath(url).split('/') if part not in ('', '.', '..')]
+        path = os.path.join(self.directory, *parts)
+        return os.path.join(path, 'index.html') if url.endswith('/') else path
+
+    def not_modified(self, etag, mtime):
+        if (tags := self.headers.get('If-None-Match')) is not None:
+            return tags.strip() == '*' or etag in [tag.strip().removeprefix('W/') for tag in tags.split(',')]
+
+        if (since := self.headers.get('If-Modified-Since')) is not None:
+            try:
+                return mtime <= parsedate_to_datetime(since).timestamp()
+            except (TypeError, ValueError, IndexError):
+                return False
+
+        return False
+
+    def serve_file(self, head):
+        path = self.translate_path(self.path)
+
+        try:
+            (etag, modified, ctype, size, mtime) = metadata(path)
+        except IsADirectoryError:
+            parts = urlsplit(self.path)
+            self.send_response(301)
+            self.send_header('Location', parts._replace(path=parts.path + '/').geturl())
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        except OSError:
+            self.send_error(404)
+            return
+
+        if self.not_modified(etag, mtime):
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.send_header('Last-Modified', modified)
+            self.end_headers()
+            return
+
+        (first, last) = (0, size - 1)
+        header = self.headers.get('Range')
+        status = 200
+
+        if header is not None and self.headers.get('If-Range', etag) in (etag, modified):
+            bounds = byterange(header, size)
+
+            if bounds is False:
+                self.send_response(416)
+                self.send_header('Content-Range', f'bytes */{size}')
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+                return
+
+            if bounds is not None:
+                ((first, last), status) = (bounds, 206)
+
+        self.send_response(status)
+        self.send_header('Content-type', ctype)
+        self.send_header('Content-Length', str(last - first + 1))
+        self.send_header('ETag', etag)
+        self.send_header('Last-Modified', modified)
+        self.send_header('Accept-Ranges', 'bytes')
+
+        if status == 206:
+            self.send_header('Content-Range', f'bytes {first}-{last}/{size}')
+
         self.end_headers()
-        self.wfile.write(b'{"status": "OK"}')
+
+        if not head and last >= first:
+            try:
+                with open(path, 'rb') as file:
+                    self.sendfile(file, first, last - first + 1)
+            except OSError:
+                self.close_connection = True
+
+
+def static(directory: str, handler: Type = StaticHandler) -> Type:
+    """
+    static: Returns subclass of handler, which serves files from directory.
+        1) directory - root directory of files.
+        2) handler - StaticHandler or its subclass.
+    """
+    return type(handler.__name__, (handler,), {'directory': os.path.abspath(directory)})
+
+
+class BacklogHTTPServer(HTTPServer):
+    """
+    BacklogHTTPServer is HTTPServer with configurable backlog of listening socket,
+    it serves connections one by one in one thread. Idle keep-alive connection would
+    block all other clients, so handler answers as HTTP/1.0 and closes every connection.
+    """
+    keepalive = False
+
+    def __init__(self: Type, address: tuple, handler: Type, backlog: int = BACKLOG,
+                 workers: int = None, reuse_port: bool = False) -> None:
+        """
+        Args:
+            address (tuple): (host, port) to listen.
+            handler (Type): subclass of BaseHTTPRequestHandler.
+            backlog (int, optional): size of queue of not accepted connections. Defaults to BACKLOG.
+            workers (int, optional): not used, accepted for the same signature of engines. Defaults to None.
+            reuse_port (bool, optional): set SO_REUSEPORT to share port between processes. Defaults to False.
+        """
+        if not self.keepalive:
+            handler = type(handler.__name__, (handler,), {'protocol_version': 'HTTP/1.0'})
+
+        self.request_queue_size = backlog
+        self.allow_reuse_port = reuse_port
+        super().__init__(address, handler)
+
+
+class PoolHTTPServer(BacklogHTTPServer):
+    """
+    PoolHTTPServer is HTTPServer which handles connections in a pool of threads.
+    Keep-alive connection holds its thread until it's closed or idle for handler.timeout.
+    """
+    keepalive = True
+
+    def __init__(self: Type, address: tuple, handler: Type, backlog: int = BACKLOG,
+                 workers: int = None, reuse_port: bool = False) -> None:
+        """
+        Args:
+            workers (int, optional): number of threads. Defaults to None (ThreadPoolExecutor default).
+        """
+        self.pool = ThreadPoolExecutor(max_workers=workers)
+        super().__init__(address, handler, backlog, workers, reuse_port)
+
+    def process_request(self: Type, request: Any, client_address: tuple) -> None:
+        self.pool.submit(self.process_request_thread, request, client_address)
+
+    def process_request_thread(self: Type, request: Any, client_address: tuple) -> None:
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+    def server_close(self: Type) -> None:
+        super().server_close()
+        self.pool.shutdown(wait=False, cancel_futures=True)
+
+
+def buffered(handler: Type) -> Type:
+    """
+    buffered: Returns subclass of handler which handles one request read into bytes
+    and writes response to BytesIO, so the same handler can be used by asyncio engine.
+    Files passed to sendfile are kept open and sent by the event loop after response.
+        1) handler - subclass of BaseHTTPRequestHandler.
+    """
+    class Buffered(handler):
+        def setup(self: Type) -> None:
+            self.rfile = BytesIO(self.request)
+            self.wfile = BytesIO()
+            self.files = []
+
+        def sendfile(self: Type, file: Any, offset: int, count: int) -> None:
+            self.files.append((os.fdopen(os.dup(file.fileno()), 'rb'), offset, count))
+
+        def handle(self: Type) -> None:
+            self.close_connection = True
+            self.handle_one_request()
+
+        def finish(self: Type) -> None:
+            pass
+
+    Buffered.__name__ = Buffered.__qualname__ = f'Buffered{handler.__name__}'
+    return Buffered
+
+
+def contentlength(head: bytes) -> int:
+    """
+    contentlength: Returns value of Content-Length header of request head or 0.
+        1) head - request line and headers.
+    """
+    for line in head.split(b'\r\n')[1:]:
+        (name, _, value) = line.partition(b':')
+
+        if name.strip().lower() == b'content-length':
+            return int(value) if value.strip().isdigit() else 0
+
+    return 0
+
+
+class AsyncHTTPServer:
+    """
+    AsyncHTTPServer serves handler from asyncio event loop, all connections share one thread.
+    Request head and body (by Content-Length) are read without blocking, then handler runs
+    on them in the loop or, if workers is given, in a pool of threads.
+    """
+    def __init__(self: Type, address: tuple, handler: Type, backlog: int = BACKLOG,
+                 workers: int = None, reuse_port: bool = False) -> None:
+        """
+        Args:
+            address (tuple): (host, port) to listen.
+            handler (Type): subclass of BaseHTTPRequestHandler.
+            backlog (int, optional): size of queue of not accepted connections. Defaults to BACKLOG.
+            workers (int, optional): threads for slow handlers, None runs them in the loop. Defaults to None.
+            reuse_port (bool, optional): set SO_REUSEPORT to share port between processes. Defaults to False.
+        """
+        self.handler = buffered(handler)
+        self.timeout = handler.timeout
+        self.workers = workers
+        self.backlog = backlog
+        self.socket = socket.create_server(address, backlog=backlog, reuse_port=reuse_port)
+        self.server_address = self.socket.getsockname()
+
+    def respond(self: Type, request: bytes, client_address: tuple) -> tuple:
+        """
+        respond is a method that returns (response, close_connection, files) for one request,
+        files is list of (file, offset, count) to be sent after response.
+        """
+        handler = self.handler(request, client_address, self)
+        return (handler.wfile.getvalue(), handler.close_connection, handler.files)
+
+    async def connection(self: Type, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """
+        connection is a method that serves requests of one connection until it's closed.
+        """
+        loop = asyncio.get_running_loop()
+        client_address = writer.get_extra_info('peername')
+
+        try:
+            while True:
+                try:
+                    head = await asyncio.wait_for(reader.readuntil(b'\r\n\r\n'), self.timeout)
+                    length = contentlength(head)
+                    request = head + await reader.readexactly(length) if length else head
+                except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, asyncio.TimeoutError, OSError):
+                    break
+
+                if self.pool is None:
+                    (response, close, files) = self.respond(request, client_address)
+                else:
+                    (response, close, files) = await loop.run_in_executor(
+                        self.pool, self.respond, request, client_address
+                    )
+
+                writer.write(response)
+
+                for (file, offset, count) in files:
+                    with file:
+                        await loop.sendfile(writer.transport, file, offset, count)
+
+                await writer.drain()
+
+                if close:
+                    break
+        except OSError:
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self: Type) -> None:
+        """
+        serve is a coroutine that accepts connections forever.
+        """
+        server = await asyncio.start_server(self.connection, sock=self.socket, backlog=self.backlog, limit=MAXHEAD)
+
+        async with server:
+            await server.serve_forever()
+
+    def serve_forever(self: Type) -> None:
+        self.pool = ThreadPoolExecutor(max_workers=self.workers) if self.workers else None
+        asyncio.run(self.serve())
+
+    def server_close(self: Type) -> None:
+        self.socket.close()
+
+        if getattr(self, 'pool', None) is not None:
+            self.pool.shutdown(wait=False, cancel_futures=True)
+
+
+ENGINES = {
+    'single': BacklogHTTPServer,
+    'thread': PoolHTTPServer,
+    'asyncio': AsyncHTTPServer,
+}
+
+
+def run(server: Any) -> None:
+    """
+    run: Serves server until KeyboardInterrupt or SIGTERM and closes it.
+    SIGTERM handler is installed only in main thread, where signals are delivered.
+        1) server - server of any engine.
+    """
+    if threading.current_thread() is threading.main_thread():
+        signal.signal(signal.SIGTERM, signal.default_int_handler)
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+def prefork(make: Any, processes: int, reuse_port: bool) -> None:
+    """
+    prefork: Runs server in several child processes and waits for them.
+        1) make - function without arguments, which returns bound server.
+        2) processes - number of child processes.
+        3) reuse_port - if True, every child binds its own socket with SO_REUSEPORT and
+           kernel balances connections between them, else children share socket of parent.
+    """
+    server = None if reuse_port else make()
+    children = []
+
+    for _ in range(processes):
+        pid = os.fork()
+
+        if pid == 0:
+            try:
+                run(server if server is not None else make())
+            finally:
+                os._exit(0)
+
+        children.append(pid)
+
+    if server is not None:
+        server.socket.close()
+
+    try:
+        for pid in children:
+            os.waitpid(pid, 0)
+    except KeyboardInterrupt:
+        for pid in children:
+            try:
+                os.kill(pid, signal.SIGTERM)
+                os.waitpid(pid, 0)
+            except (ProcessLookupError, ChildProcessError):
+                pass
+
+
+def serve(engine: str = 'thread', address: tuple = ADDRESS, handler: Type = RequestHandler,
+          backlog: int = BACKLOG, workers: int = None, processes: int = 1) -> None:
+    """
+    serve: Serves handler forever by engine.
+        1) engine - 'single', 'thread' or 'asyncio'.
+        2) address - (host, port) to listen.
+        3) handler - subclass of BaseHTTPRequestHandler.
+        4) backlog - size of queue of not accepted connections.
+        5) workers - threads of 'thread' engine or threads for handlers of 'asyncio' engine.
+        6) processes - if more than 1, engine is pre-forked to this number of processes.
+    """
+    factory = ENGINES[engine]
+    reuse_port = processes > 1 and hasattr(socket, 'SO_REUSEPORT')
+
+    def make() -> Any:
+        return factory(address, handler, backlog, workers, reuse_port)
+
+    if processes > 1:
+        prefork(make, processes, reuse_port)
+    else:
+        run(make())
+
+
+def main(argv: list = None) -> None:
+    """
+    main: Command line interface of the server.
+    """
+    parser = argparse.ArgumentParser(description='Simple HTTP/1.1 server.')
+    parser.add_argument('--engine', default='thread', choices=ENGINES)
+    parser.add_argument('--host', default=IPV4)
+    parser.add_argument('--port', type=int, default=PORT)
+    parser.add_argument('--backlog', type=int, default=BACKLOG, help='queue of not accepted connections')
+    parser.add_argument('--workers', type=int, help='threads of the engine')
+    parser.add_argument('--processes', type=int, default=1, help='pre-forked processes')
+    parser.add_argument('--static', help='serve files of this directory')
+    args = parser.parse_args(argv)
+    handler = static(args.static) if args.static else RequestHandler
+
+    serve(args.engine, (args.host, args.port), handler, args.backlog, args.workers, args.processes)
 
 
-server = HTTPServer(ADDRESS, RequestHandler)
-server.serve_forever()
+if __name__ == '__main__':
+    main()
@@ -1,39 +1,58 @@
 #! /usr/bin/env python3
 # -*- coding: utf-8 -*-
 """
-mailsvs.py: Provides POP3-client, IMAP-client, SMTP-client.
+nettools.py: Provides POP3-client, IMAP-client, SMTP-client, FTP-client.
+Protocol modules are imported and ENV variables are read on first use of clients,
+so importing this module is cheap and doesn't require dotenv or .env file.
+
+Usage (from root of repository, so moduletools can be imported):
+python -m nettools.nettools
 """
 
 
-from email.mime.multipart import MIMEMultipart
-from email.mime.text import MIMEText
-from dotenv import load_dotenv
-import webbrowser
-import tempfile
-import getpass
-import imaplib
-import smtplib
-import poplib
-import ftplib
-import base64
-import email
-import re
+from moduletools.lazy import lazyattrs
 import os
 
 
-poplib._MAXLINE = 20480
+SETTINGS = (
+    'POP3_MAIL_SERVER', 'IMAP_MAIL_SERVER', 'SMTP_MAIL_SERVER', 'MAIL_USERNAME',
+    'MAIL_PASSWORD', 'FTP_SERVER', 'FTP_USERNAME', 'FTP_PASSWORD',
+)
+CONFIG = {}
+
+
+def configure(path: str = '.env') -> dict:
+    """
+    configure is a function that reads ENV variables from file to CONFIG.
+    It's called on first use of clients or settings, not at import, so importing
+    this module doesn't require dotenv and .env file.
+
+    Args:
+        path (str, optional): file with ENV variables. Defaults to '.env'.
+
+    Raises:
+        Exception: file can't be read.
+
+    Returns:
+        dict: {name: value} of SETTINGS.
+    """
+    from dotenv import load_dotenv
+
+    if load_dotenv(path, encoding='UTF-8') is not True:
+        raise Exception('Failed to read ENV variables')
 
-if load_dotenv('.env', encoding='UTF-8') is True:
-    POP3_MAIL_SERVER = os.getenv('POP3_MAIL_SERVER')
-    IMAP_MAIL_SERVER = os.getenv('IMAP_MAIL_SERVER')
-    SMTP_MAIL_SERVER = os.getenv('SMTP_MAIL_SERVER')
-    MAIL_USERNAME = os.getenv('MAIL_USERNAME')
-    MAIL_PASSWORD = os.getenv('MAIL_PASSWORD')
-    FTP_SERVER = os.getenv('FTP_SERVER')
-    FTP_USERNAME = os.getenv('FTP_USERNAME')
-    FTP_PASSWORD = os.getenv('FTP_PASSWORD')
-else:
-    raise Exception('Failed to read ENV variables')
+    CONFIG.update((name, os.getenv(name)) for name in SETTINGS)
+    return CONFIG
+
+
+def configured() -> dict:
+    """
+    configured is a function that calls configure once and returns settings.
+    """
+    return CONFIG or configure()
+
+
+__getattr__ = lazyattrs(configured, SETTINGS, __name__)
 
 
 def email_to_html(parsed: str) -> str:
@@ -64,6 +83,9 @@ def display(html: str) -> None:
     Args:
         html (str): message in html format.
     """
+    import webbrowser
+    import tempfile
+
     with tempfile.NamedTemporaryFile('w', delete=False, suffix='.html') as f:
         url = 'file://' + f.name
         f.write(html)
@@ -76,9 +98,17 @@ def pop3() -> None:
     It allows reading messages from your mailbox.
     It also allows printing and deleting them.
     """
-    server_name = input(f'POP3 server("{POP3_MAIL_SERVER}" by default): ') or POP3_MAIL_SERVER
-    username = input(f'Username("{MAIL_USERNAME}" by default): ') or MAIL_USERNAME
-    password = getpass.getpass(f'Password("{MAIL_PASSWORD[:4]}***" by default): ') or MAIL_PASSWORD
+    import getpass
+    import base64
+    import poplib
+    import email
+    import re
+
+    poplib._MAXLINE = 20480
+    settings = configured()
+    server_name = input(f'POP3 server("{settings["POP3_MAIL_SERVER"]}" by default): ') or settings['POP3_MAIL_SERVER']
+    username = input(f'Username("{settings["MAIL_USERNAME"]}" by default): ') or settings['MAIL_USERNAME']
+    password = getpass.getpass(f'Password("{settings["MAIL_PASSWORD"][:4]}***" by default): ') or settings['MAIL_PASSWORD']
 
     try:
         server = poplib.POP3_SSL(server_name)
@@ -134,9 +164,16 @@ def imap() -> None:
     It allows reading messages from your mailbox.
     It also allows printing and deleting them.
     """
-    server_name = input(f'IMAP server("{IMAP_MAIL_SERVER}" by default): ') or IMAP_MAIL_SERVER
-    username = input(f'Username("{MAIL_USERNAME}" by default): ') or MAIL_USERNAME
-    password = getpass.getpass(f'Password("{MAIL_PASSWORD[:4]}***" by default): ') or MAIL_PASSWORD
+    import getpass
+    import imaplib
+    import base64
+    import email
+    import re
+
+    settings = configured()
+    server_name = input(f'IMAP server("{settings["IMAP_MAIL_SERVER"]}" by default): ') or settings['IMAP_MAIL_SERVER']
+    username = input(f'Username("{settings["MAIL_USERNAME"]}" by default): ') or settings['MAIL_USERNAME']
+    password = getpass.getpass(f'Password("{settings["MAIL_PASSWORD"][:4]}***" by default): ') or settings['MAIL_PASSWORD']
 
     try:
         server = imaplib.IMAP4_SSL(server_name)
@@ -191,9 +228,15 @@ def smtp() -> None:
     smtp: Function which implements SMTP-client.
     It allows sending messages from your mbox to others.
     """
-    server_name = input(f'SMTP server("{SMTP_MAIL_SERVER}" by default): ') or SMTP_MAIL_SERVER
-    username = input(f'Username("{MAIL_USERNAME}" by default): ') or MAIL_USERNAME
-    password = getpass.getpass(f'Password("{MAIL_PASSWORD[:4]}***" by default): ') or MAIL_PASSWORD
+    from email.mime.multipart import MIMEMultipart
+    from email.mime.text import MIMEText
+    import getpass
+    import smtplib
+
+    settings = configured()
+    server_name = input(f'SMTP server("{settings["SMTP_MAIL_SERVER"]}" by default): ') or settings['SMTP_MAIL_SERVER']
+    username = input(f'Username("{settings["MAIL_USERNAME"]}" by default): ') or settings['MAIL_USERNAME']
+    password = getpass.getpass(f'Password("{settings["MAIL_PASSWORD"][:4]}***" by default): ') or settings['MAIL_PASSWORD']
 
     try:
         server = smtplib.SMTP_SSL(server_name)
@@ -226,9 +269,13 @@ def ftp() -> None:
     ftp: Function which implements FTP-client.
     It allows manipulating with files on the FTP server.
     """
-    server_name = input(f'FTP server("{FTP_SERVER}" by default): ') or FTP_SERVER
-    username = input(f'Username("{FTP_USERNAME}" by default): ') or FTP_USERNAME
-    password = getpass.getpass(f'Password("{FTP_PASSWORD[:4]}***" by default): ') or FTP_PASSWORD
+    import getpass
+    import ftplib
+
+    settings = configured()
+    server_name = input(f'FTP server("{settings["FTP_SERVER"]}" by default): ') or settings['FTP_SERVER']
+    username = input(f'Username("{settings["FTP_USERNAME"]}" by default): ') or settings['FTP_USERNAME']
+    password = getpass.getpass(f'Password("{settings["FTP_PASSWORD"][:4]}***" by default): ') or settings['FTP_PASSWORD']
 
     try:
         server = ftplib.FTP(server_name)
@@ -0,0 +1,16 @@
+#! /usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+timetools: Instruments for timing functions and decorators.
+Submodules and names are imported on first access (PEP 562).
+"""
+
+
+from moduletools.lazy import lazymodule
+
+
+(__getattr__, __dir__, __all__) = lazymodule(__name__, ['decobench', 'speedr', 'timer', 'timerd'], {
+    'total': 'timer',
+    'bestof': 'timer',
+    'bestoftotal': 'timer',
+})
@@ -0,0 +1,231 @@
+#! /usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+decobench.py: Measures per-call overhead of decorators from this package in nanoseconds.
+Every case times the same statement with the decorated and the undecorated callable,
+overhead is the difference of best-of-repeat times divided by number of calls.
+Results can be saved as JSON and compared with results of the previous run.
+
+Usage (from the root of the repository):
+python -m timetools.decobench
+python -m timetools.decobench --number 200000 --json bench.json
+python -m timetools.decobench --compare bench.json
+"""
+
+
+from typing import Iterable
+import platform
+import argparse
+import timeit
+import json
+import sys
+
+
+DEFNUM = 100000
+DEFREP = 5
+
+SHAPES = {
+    'positional': 'f(1, 2, 3)',
+    'keyword': 'f(a=1, b=2, c=3)',
+    'mixed': 'f(1, b=2, c=3)',
+}
+
+
+def function(a, b, c):
+    """
+    function: Undecorated baseline for function decorators.
+    """
+    return a
+
+
+def argtools_cases() -> Iterable:
+    """
+    argtools_cases: Yields (name, shape, statement, decorated, baseline) for argtools.
+    """
+    from argtools.argstest import rangetest, typetest, valuetest, each, Sampler, PredicateCache
+
+    decorators = {
+        'rangetest': rangetest(a=(0, 10), c=(0, 10)),
+        'typetest': typetest(a=int, b=int, c=int),
+        'valuetest': valuetest(a=lambda x: x > 0),
+        'valuetest+cache': valuetest(None, PredicateCache(), a=lambda x: x > 0),
+        'rangetest+sampler': rangetest(Sampler(every=100), a=(0, 10), c=(0, 10)),
+    }
+
+    for (name, decorator) in decorators.items():
+        decorated = decorator(function)
+
+        for (shape, stmt) in SHAPES.items():
+            yield (f'argtools.{name}', shape, stmt, decorated, function)
+
+    def sequence(a):
+        return a
+
+    decorated = rangetest(a=each(0, 255))(sequence)
+    yield ('argtools.rangetest(each)', 'list[1000]', 'f(a)', decorated, sequence)
+
+
+def attrtools_cases() -> Iterable:
+    """
+    attrtools_cases: Yields (name, shape, statement, decorated, baseline) for attrtools.privacy.
+    """
+    from attrtools.privacy import private, public
+
+    class Person:
+        def __init__(self, name, age):
+            self.name = name
+            self.age = age
+
+        def __len__(self):
+            return self.age
+
+    for (name, decorator) in (('private', private('age')), ('public', public('name', '__len__'))):
+        decorated = decorator(Person)('mark', 22)
+        baseline = Person('mark', 22)
+        yield (f'attrtools.{name}', 'getattr', 'f.name', decorated, baseline)
+        yield (f'attrtools.{name}', 'setattr', 'f.name = "bob"', decorated, baseline)
+        yield (f'attrtools.{name}', 'dunder', 'len(f)', decorated, baseline)
+
+
+def timetools_cases() -> Iterable:
+    """
+    timetools_cases: Yields (name, shape, statement, decorated, baseline) for timetools.timerd.
+    """
+    from timetools.timerd import timer
+
+    decorated = timer(trace=False)(function)
+
+    for (shape, stmt) in SHAPES.items():
+        yield ('timetools.timer', shape, stmt, decorated, function)
+
+
+def classtools_cases() -> Iterable:
+    """
+    classtools_cases: Yields (name, shape, statement, decorated, baseline) for classtools.autod.
+    """
+    from classtools.autod import decorate_all, MetaDecorate
+    from timetools.timerd import timer
+
+    class Plain:
+        def method(self, a, b, c):
+            return a
+
+    metaclasses = {
+        'decorate_all': decorate_all(timer(trace=False)),
+        'MetaDecorate': MetaDecorate(decorators=[timer(trace=False)]),
+    }
+
+    for (name, metaclass) in metaclasses.items():
+        Decorated = metaclass('Decorated', (), {'method': Plain.__dict__['method']})
+
+        for (shape, stmt) in SHAPES.items():
+            stmt = stmt.replace('f(', 'f.method(')
+            yield (f'classtools.{name}', shape, stmt, Decorated(), Plain())
+
+
+CASES = [argtools_cases, attrtools_cases, timetools_cases, classtools_cases]
+
+
+def pernanos(stmt: str, target: object, setup: str, number: int, repeat: int) -> float:
+    """
+    pernanos: Returns best-of-repeat time of one statement run in nanoseconds.
+        1) stmt - statement where target is named 'f'.
+        2) target - callable or object to be measured.
+        3) setup - statement that prepares locals ('a' is a list for sequence cases).
+    """
+    timer = timeit.Timer(stmt, setup, globals={'f': target})
+    return min(timer.repeat(repeat=repeat, number=number)) / number * 1e9
+
+
+def run(number: int = DEFNUM, repeat: int = DEFREP, cases: list = CASES) -> list:
+    """
+    run: Runs all cases and returns list of records.
+        1) number - number of calls in each repeat.
+        2) repeat - number of repeats, the best one is taken.
+        3) cases - functions that yield cases.
+    """
+    records = []
+    setup = 'a = [x % 256 for x in range(1000)]'
+
+    for case in cases:
+        for (name, shape, stmt, decorated, baseline) in case():
+            base = pernanos(stmt, baseline, setup, number, repeat)
+            deco = pernanos(stmt, decorated, setup, number, repeat)
+            records.append({
+                'name': name,
+                'shape': shape,
+                'baseline_ns': round(base, 1),
+                'decorated_ns': round(deco, 1),
+                'overhead_ns': round(deco - base, 1),
+            })
+
+    return records
+
+
+def environment(number: int, repeat: int) -> dict:
+    """
+    environment: Returns description of the run to make results comparable.
+    """
+    return {
+        'python': sys.version.split()[0],
+        'implementation': platform.python_implementation(),
+        'machine': platform.machine(),
+        'debug': __debug__,
+        'number': number,
+        'repeat': repeat,
+    }
+
+
+def report(records: list, previous: list = None, file: object = sys.stdout) -> None:
+    """
+    report: Prints records as a table.
+        1) records - records of the current run.
+        2) previous - records of the previous run or None, adds change column.
+        3) file - stream to print to.
+    """
+    before = {(rec['name'], rec['shape']): rec['overhead_ns'] for rec in previous or []}
+    header = f'{"decorator":<32}{"shape":<12}{"base ns":>10}{"deco ns":>10}{"overhead":>10}'
+    print(header + (f'{"change":>10}' if previous else ''), file=file)
+    print('-' * (len(header) + (10 if previous else 0)), file=file)
+
+    for rec in records:
+        line = (
+            f'{rec["name"]:<32}{rec["shape"]:<12}{rec["baseline_ns"]:>10.1f}'
+            f'{rec["decorated_ns"]:>10.1f}{rec["overhead_ns"]:>10.1f}'
+        )
+
+        if previous:
+            old = before.get((rec['name'], rec['shape']))
+            line += f'{rec["overhead_ns"] - old:>+10.1f}' if old is not None else f'{"new":>10}'
+
+        print(line, file=file)
+
+
+def main(argv: list = None) -> None:
+    """
+    main: Command line interface of the benchmark.
+    """
+    parser = argparse.ArgumentParser(description='Per-call overhead of decorators.')
+    parser.add_argument('--number', type=int, default=DEFNUM, help='calls in each repeat')
+    parser.add_argument('--repeat', type=int, default=DEFREP, help='repeats, the best one is taken')
+    parser.add_argument('--json', help='save results to this file')
+    parser.add_argument('--compare', help='compare with results saved in this file')
+    args = parser.parse_args(argv)
+
+    records = run(args.number, args.repeat)
+    previous = None
+
+    if args.compare:
+        with open(args.compare, encoding='UTF-8') as file:
+            previous = json.load(file)['records']
+
+    print(environment(args.number, args.repeat))
+    report(records, previous)
+
+    if args.json:
+        with open(args.json, 'w', encoding='UTF-8') as file:
+            json.dump({'environment': environment(args.number, args.repeat), 'records': records}, file, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -17,6 +17,7 @@ listcomp(60000000)
 
 
 from typing import Callable, Any
+from types import SimpleNamespace
 import time
 import sys
 
@@ -72,4 +73,41 @@ def timer(label: str = '', trace: bool = True) -> Callable:
         on_call.total = 0
         on_call.best = sys.maxsize
         return on_call
+
+    def hooks(func: Callable) -> dict:
+        """
+        hooks is a function that implements hooks protocol of classtools.autod.fuse
+        in source form, so fused timer costs no calls. Statistics are kept in total
+        and best attributes of stats in namespace.
+
+        Args:
+            func (Callable): original function.
+
+        Returns:
+            dict: source form of hooks.
+        """
+        def report(performing_time: float) -> None:
+            print(
+                f'{label}{func.__name__}: {performing_time:.5f}, '
+                f'{stats.total:.5f}, {stats.best:.5f}'
+            )
+
+        stats = SimpleNamespace(total=0, best=sys.maxsize)
+        post = [
+            '{elapsed} = {clock}() - {state}',
+            '{stats}.total += {elapsed}',
+            'if {elapsed} < {stats}.best:',
+            '    {stats}.best = {elapsed}',
+        ]
+
+        if trace:
+            post.append('{report}({elapsed})')
+
+        return {
+            'namespace': {'clock': clock, 'stats': stats, 'report': report},
+            'pre': ['{state} = {clock}()'],
+            'post': post,
+        }
+
+    on_decorator.hooks = hooks
     return on_decorator